@@ -0,0 +1,104 @@
+"""
+Project view and click counters
+
+Events are counted in memory per project, time bucket and event type, and
+written periodically as one `$inc` upsert per project and bucket: the
+database sees a handful of writes per flush however many events arrive.
+Counts still in memory are lost if the process dies before its next flush.
+
+Each batch carries a flush id. A batch whose write fails (or is cancelled)
+is retried as is, with the same id, before newer counts are written; the
+writer uses the id to skip documents the earlier attempt already updated.
+"""
+
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from collections import Counter, defaultdict
+import asyncio
+import logging
+import time
+import uuid
+
+from models import ProjectEvent
+
+logger = logging.getLogger(__name__)
+
+# (project id, bucket start as a UNIX timestamp) -> event type -> count
+PendingCounts = Dict[Tuple[uuid.UUID, int], Counter]
+
+DEFAULT_BUCKET_SECONDS = 3600
+DEFAULT_FLUSH_INTERVAL = 10.0
+# Distinct (project, bucket) keys held between flushes, including a batch
+# awaiting retry; beyond this new keys are dropped, so bogus project ids
+# cannot grow memory while the DB is down
+DEFAULT_MAX_PENDING = 10000
+
+
+class EventAggregator:
+    """Pre-aggregates project events and hands them to `flush` in batches"""
+
+    def __init__(
+        self,
+        flush: Callable[[PendingCounts, uuid.UUID], Awaitable[None]],
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self._flush = flush
+        self.bucket_seconds = bucket_seconds
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: PendingCounts = defaultdict(Counter)
+        # (flush id, counts) of a batch whose write has not succeeded yet
+        self._retry: Optional[Tuple[uuid.UUID, PendingCounts]] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + (len(self._retry[1]) if self._retry else 0)
+
+    def record(self, events: Iterable[ProjectEvent], at: Optional[float] = None):
+        """Count events received at `at` (server time, default now)"""
+        at = time.time() if at is None else at
+        bucket = int(at // self.bucket_seconds) * self.bucket_seconds
+        pending = self._pending
+        held = self.pending
+        for event in events:
+            key = (event.project_id, bucket)
+            if key not in pending:
+                if held >= self.max_pending:
+                    self.dropped += 1
+                    continue
+                held += 1
+            pending[key][event.type.value] += 1
+
+    async def flush(self) -> int:
+        """Write the pending counts; returns the number of keys written
+
+        A batch left by a failed flush is written first. If any write fails
+        the exception propagates and the batch stays queued for retry.
+        """
+        written = 0
+        if self._retry is not None:
+            written += await self._write_batch()
+        if self._pending:
+            self._retry = (uuid.uuid4(), self._pending)
+            self._pending = defaultdict(Counter)
+            written += await self._write_batch()
+        return written
+
+    async def _write_batch(self) -> int:
+        flush_id, counts = self._retry
+        await self._flush(counts, flush_id)
+        self._retry = None
+        return len(counts)
+
+    async def run(self):
+        """Flush every `flush_interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                written = await self.flush()
+                if written:
+                    logger.debug("Flushed %s project event counters", written)
+            except Exception as e:
+                logger.error("Error flushing project events: %s", e)
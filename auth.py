@@ -0,0 +1,147 @@
+"""
+Admin authentication
+
+Admins exchange a username and password for a short-lived HS256 JWT at
+`POST /api/auth/token` and send it as `Authorization: Bearer <token>`.
+Settings come from the environment:
+
+- JWT_SECRET: signing key; admin access is refused (403) while it is unset
+- ADMIN_USERNAME: defaults to "admin"
+- ADMIN_PASSWORD_HASH: passlib pbkdf2_sha256 hash of the admin password
+- JWT_TTL_SECONDS: token lifetime, default one hour
+
+Verified tokens are remembered in a small LRU until they expire, so repeat
+requests with the same token skip the signature check.
+"""
+
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from fastapi import Header, HTTPException
+from passlib.hash import pbkdf2_sha256
+from starlette.concurrency import run_in_threadpool
+import hmac
+import jwt
+import os
+import threading
+import time
+
+ALGORITHM = "HS256"
+ISSUER = "portfolio-api"
+DEFAULT_TTL_SECONDS = 3600
+VERIFIED_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    # Verified against when the username is wrong, so a miss costs the same
+    # as a wrong password and does not reveal which of the two was wrong
+    return pbkdf2_sha256.hash("portfolio-admin-placeholder")
+
+
+@lru_cache(maxsize=1)
+def signing_key() -> Optional[bytes]:
+    """JWT_SECRET as bytes, read once per process"""
+    secret = os.environ.get("JWT_SECRET")
+    return secret.encode() if secret else None
+
+
+def token_ttl() -> int:
+    return int(os.environ.get("JWT_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+
+class VerifiedTokens:
+    """LRU of token -> claims for tokens whose signature has been checked"""
+
+    def __init__(self, max_size: int = VERIFIED_CACHE_SIZE):
+        self.max_size = max_size
+        self._claims: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str, now: float) -> Optional[dict]:
+        with self._lock:
+            claims = self._claims.get(token)
+            if claims is None:
+                return None
+            if claims["exp"] <= now:
+                del self._claims[token]
+                return None
+            self._claims.move_to_end(token)
+            return claims
+
+    def put(self, token: str, claims: dict):
+        with self._lock:
+            self._claims[token] = claims
+            self._claims.move_to_end(token)
+            while len(self._claims) > self.max_size:
+                self._claims.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._claims.clear()
+
+
+verified_tokens = VerifiedTokens()
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+def _require_key() -> bytes:
+    key = signing_key()
+    if key is None:
+        raise HTTPException(status_code=403, detail="Admin access is not configured")
+    return key
+
+
+def issue_token(username: str, now: Optional[float] = None) -> Tuple[str, int]:
+    """Signed admin token and its lifetime in seconds"""
+    now = time.time() if now is None else now
+    ttl = token_ttl()
+    claims = {"sub": username, "iss": ISSUER, "iat": int(now), "exp": int(now) + ttl}
+    return jwt.encode(claims, _require_key(), algorithm=ALGORITHM), ttl
+
+
+def verify_token(token: str) -> Dict:
+    """Claims of a valid admin token; raises 401 otherwise"""
+    key = _require_key()
+    now = time.time()
+    claims = verified_tokens.get(token, now)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(
+            token, key, algorithms=[ALGORITHM], issuer=ISSUER,
+            options={"require": ["exp", "iat", "sub"]},
+        )
+    except jwt.PyJWTError:
+        raise _unauthorized("Invalid admin credentials")
+    verified_tokens.put(token, claims)
+    return claims
+
+
+async def authenticate(username: str, password: str) -> bool:
+    """Check admin credentials; hashing runs in the thread pool"""
+    password_hash = os.environ.get("ADMIN_PASSWORD_HASH")
+    if not password_hash or signing_key() is None:
+        raise HTTPException(status_code=403, detail="Admin access is not configured")
+    expected_username = os.environ.get("ADMIN_USERNAME", "admin")
+    username_matches = hmac.compare_digest(username.encode(), expected_username.encode())
+    password_matches = await run_in_threadpool(
+        _verify_password, password, password_hash if username_matches else None
+    )
+    return username_matches and password_matches
+
+
+def _verify_password(password: str, password_hash: Optional[str]) -> bool:
+    return pbkdf2_sha256.verify(password, password_hash or _dummy_hash())
+
+
+async def require_admin(authorization: Optional[str] = Header(default=None)) -> Dict:
+    """Allow the request only with a valid admin token; returns its claims"""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        _require_key()
+        raise _unauthorized("Invalid admin credentials")
+    return verify_token(token)
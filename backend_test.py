@@ -2,14 +2,40 @@
 """
 Comprehensive Backend API Testing Suite for Portfolio Application
 Tests all endpoints for functionality, data validation, and error handling
+
+By default the app runs in-process over an ASGI transport against an
+in-memory Mongo stand-in, so no network or database is needed. Independent
+checks run concurrently.
+
+    python backend_test.py                       # offline, in-process
+    python backend_test.py --timing timings.json # also record per-endpoint latency
+    python backend_test.py --remote              # deployed backend from frontend/.env
+    python backend_test.py --fixtures DUMP_DIR   # in-process, data from `datactl.py dump`
+
+Admin checks log in with ADMIN_USERNAME (default "admin") and ADMIN_PASSWORD;
+in-process runs generate both the password and the signing key.
 """
 
-import requests
-import json
 import os
+import tempfile
+
+# Keep offline runs away from the shared snapshot and last-known-good files
+os.environ.setdefault("SHARED_SNAPSHOT_PATH", "")
+os.environ.setdefault("LKG_SNAPSHOT_PATH", os.path.join(tempfile.mkdtemp(), "last_known_good.json"))
+
+import argparse
+import asyncio
+import json
+import secrets
+import statistics
+import subprocess
 import sys
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from pathlib import Path
+
+import httpx
 
 # Get backend URL from frontend .env file
 def get_backend_url():
@@ -24,20 +50,61 @@ def get_backend_url():
         return None
     return None
 
+async def create_in_process_client(fixtures: Optional[str] = None) -> httpx.AsyncClient:
+    """Client for the app running in this process on an in-memory database
+
+    The database is seeded with the mock data, or loaded from a dump directory.
+    """
+    import database
+    from memory_mongo import MemoryMongoClient
+    from seed_data import seed_database
+    from server import app
+
+    from passlib.hash import pbkdf2_sha256
+
+    # Admin credentials for this run only
+    os.environ.setdefault("JWT_SECRET", secrets.token_hex(32))
+    os.environ.setdefault("ADMIN_PASSWORD", secrets.token_urlsafe(16))
+    os.environ.setdefault("ADMIN_PASSWORD_HASH", pbkdf2_sha256.hash(os.environ["ADMIN_PASSWORD"]))
+
+    database.db = database.Database("memory://", "portfolio_test", client=MemoryMongoClient())
+    if fixtures:
+        from datactl import restore_database
+        await restore_database(database.db, Path(fixtures))
+    else:
+        await seed_database()
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+
 class PortfolioAPITester:
-    def __init__(self):
-        self.base_url = get_backend_url()
-        if not self.base_url:
-            raise Exception("Could not get backend URL from frontend/.env")
-        
-        self.api_url = f"{self.base_url}/api"
+    def __init__(self, client: httpx.AsyncClient, base_url: str = ""):
+        self.client = client
+        self.api_url = f"{base_url}/api"
         self.test_results = []
         self.total_tests = 0
         self.passed_tests = 0
-        
-        print(f"Testing Portfolio API at: {self.api_url}")
+        # "METHOD /path" -> latencies in seconds
+        self.latencies: Dict[str, List[float]] = {}
+
+        print(f"Testing Portfolio API at: {client.base_url}{self.api_url}")
         print("=" * 60)
-    
+
+    async def admin_headers(self) -> Dict[str, str]:
+        """Authorization header with a token for ADMIN_USERNAME/ADMIN_PASSWORD"""
+        response = await self.request("POST", "/auth/token", json={
+            "username": os.environ.get("ADMIN_USERNAME", "admin"),
+            "password": os.environ.get("ADMIN_PASSWORD", ""),
+        })
+        if response.status_code != 200:
+            return {}
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request and record its latency under the endpoint it hit"""
+        started = time.perf_counter()
+        response = await self.client.request(method, f"{self.api_url}{path}", timeout=10, **kwargs)
+        self.latencies.setdefault(f"{method} /api{path}", []).append(time.perf_counter() - started)
+        return response
+
     def log_test(self, test_name: str, passed: bool, details: str = ""):
         """Log test result"""
         self.total_tests += 1
@@ -46,7 +113,7 @@ class PortfolioAPITester:
             status = "✅ PASS"
         else:
             status = "❌ FAIL"
-        
+
         result = {
             "test": test_name,
             "passed": passed,
@@ -57,15 +124,12 @@ class PortfolioAPITester:
         print(f"{status} - {test_name}")
         if details:
             print(f"    Details: {details}")
-    
-    def test_health_check(self):
+
+    async def test_health_check(self):
         """Test GET /api/ endpoint for basic connectivity"""
-        print("\n1. Testing Health Check Endpoint")
-        print("-" * 40)
-        
         try:
-            response = requests.get(f"{self.api_url}/", timeout=10)
-            
+            response = await self.request("GET", "/")
+
             if response.status_code == 200:
                 data = response.json()
                 if "message" in data and "status" in data:
@@ -74,19 +138,16 @@ class PortfolioAPITester:
                     self.log_test("Health Check", False, "Missing required fields in response")
             else:
                 self.log_test("Health Check", False, f"HTTP {response.status_code}: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Health Check", False, f"Connection error: {str(e)}")
-    
-    def test_projects_api(self):
+
+    async def test_projects_api(self):
         """Test GET /api/projects and GET /api/projects/featured endpoints"""
-        print("\n2. Testing Projects API")
-        print("-" * 40)
-        
         # Test all projects endpoint
         try:
-            response = requests.get(f"{self.api_url}/projects", timeout=10)
-            
+            response = await self.request("GET", "/projects")
+
             if response.status_code == 200:
                 projects = response.json()
                 if isinstance(projects, list) and len(projects) > 0:
@@ -94,7 +155,7 @@ class PortfolioAPITester:
                     project = projects[0]
                     required_fields = ['id', 'title', 'description', 'image', 'technologies', 'category', 'featured']
                     optional_fields = ['demo_url', 'github_url', 'created_at', 'updated_at']
-                    
+
                     missing_fields = [field for field in required_fields if field not in project]
                     if not missing_fields:
                         self.log_test("Get All Projects", True, f"Retrieved {len(projects)} projects with correct structure")
@@ -104,14 +165,14 @@ class PortfolioAPITester:
                     self.log_test("Get All Projects", False, "No projects returned or invalid format")
             else:
                 self.log_test("Get All Projects", False, f"HTTP {response.status_code}: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Get All Projects", False, f"Connection error: {str(e)}")
-        
+
         # Test featured projects endpoint
         try:
-            response = requests.get(f"{self.api_url}/projects/featured", timeout=10)
-            
+            response = await self.request("GET", "/projects/featured")
+
             if response.status_code == 200:
                 featured_projects = response.json()
                 if isinstance(featured_projects, list):
@@ -125,29 +186,26 @@ class PortfolioAPITester:
                     self.log_test("Get Featured Projects", False, "Invalid response format")
             else:
                 self.log_test("Get Featured Projects", False, f"HTTP {response.status_code}: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Get Featured Projects", False, f"Connection error: {str(e)}")
-    
-    def test_skills_api(self):
+
+    async def test_skills_api(self):
         """Test GET /api/skills endpoint with proper category grouping"""
-        print("\n3. Testing Skills API")
-        print("-" * 40)
-        
         try:
-            response = requests.get(f"{self.api_url}/skills", timeout=10)
-            
+            response = await self.request("GET", "/skills")
+
             if response.status_code == 200:
                 skills_data = response.json()
                 expected_categories = ['frontend', 'backend', 'design', 'tools']
-                
+
                 # Check if all categories are present
                 missing_categories = [cat for cat in expected_categories if cat not in skills_data]
                 if not missing_categories:
                     # Validate skill structure
                     total_skills = 0
                     valid_structure = True
-                    
+
                     for category, skills in skills_data.items():
                         if isinstance(skills, list):
                             total_skills += len(skills)
@@ -159,7 +217,7 @@ class PortfolioAPITester:
                         else:
                             valid_structure = False
                             break
-                    
+
                     if valid_structure:
                         self.log_test("Get Skills", True, f"Retrieved {total_skills} skills grouped in {len(expected_categories)} categories")
                     else:
@@ -168,23 +226,48 @@ class PortfolioAPITester:
                     self.log_test("Get Skills", False, f"Missing categories: {missing_categories}")
             else:
                 self.log_test("Get Skills", False, f"HTTP {response.status_code}: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Get Skills", False, f"Connection error: {str(e)}")
-    
-    def test_contact_info_api(self):
+
+    async def test_skills_summary(self):
+        """Test GET /api/skills/summary agrees with the skills it summarizes"""
+        try:
+            summary_response, skills_response = await asyncio.gather(
+                self.request("GET", "/skills/summary"),
+                self.request("GET", "/skills"),
+            )
+
+            if summary_response.status_code == 200 and skills_response.status_code == 200:
+                summary = summary_response.json()
+                skills_data = skills_response.json()
+                counts_match = all(
+                    summary['categories'].get(category, {}).get('count') == len(skills)
+                    for category, skills in skills_data.items()
+                )
+                levels = [skill['level'] for skill in summary['top_skills']]
+                if not counts_match:
+                    self.log_test("Skills Summary", False, "Category counts do not match /api/skills")
+                elif not levels or levels != sorted(levels, reverse=True):
+                    self.log_test("Skills Summary", False, f"Top skills not ordered by level: {levels}")
+                else:
+                    self.log_test("Skills Summary", True, f"Summarized {len(summary['categories'])} categories, top skill: {summary['top_skills'][0]['name']}")
+            else:
+                self.log_test("Skills Summary", False, f"HTTP {summary_response.status_code}: {summary_response.text}")
+
+        except httpx.HTTPError as e:
+            self.log_test("Skills Summary", False, f"Connection error: {str(e)}")
+
+    async def test_contact_info_api(self):
         """Test GET /api/contact-info endpoint"""
-        print("\n4. Testing Contact Info API")
-        print("-" * 40)
-        
         try:
-            response = requests.get(f"{self.api_url}/contact-info", timeout=10)
-            
+            response = await self.request("GET", "/contact-info")
+
             if response.status_code == 200:
                 contact_info = response.json()
                 required_fields = ['email']
                 optional_fields = ['phone', 'location', 'availability', 'response_time']
-                
+
                 # Check required fields
                 missing_required = [field for field in required_fields if field not in contact_info]
                 if not missing_required:
@@ -198,15 +281,78 @@ class PortfolioAPITester:
                     self.log_test("Get Contact Info", False, f"Missing required fields: {missing_required}")
             else:
                 self.log_test("Get Contact Info", False, f"HTTP {response.status_code}: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Get Contact Info", False, f"Connection error: {str(e)}")
-    
-    def test_contact_submission(self):
+
+    async def test_portfolio_bundle(self):
+        """Test GET /api/portfolio returns every section and honours its ETag"""
+        try:
+            response = await self.request("GET", "/portfolio")
+
+            if response.status_code == 200:
+                bundle = response.json()
+                missing_sections = [s for s in ['projects', 'featured', 'skills', 'contact_info'] if s not in bundle]
+                if missing_sections:
+                    self.log_test("Portfolio Bundle", False, f"Missing sections: {missing_sections}")
+                else:
+                    cached = await self.request("GET", "/portfolio", headers={"If-None-Match": response.headers.get("etag", "")})
+                    if cached.status_code == 304:
+                        self.log_test("Portfolio Bundle", True, f"Retrieved {len(bundle['projects'])} projects in one request, 304 on revalidation")
+                    else:
+                        self.log_test("Portfolio Bundle", False, f"Expected 304 for matching ETag, got HTTP {cached.status_code}")
+            else:
+                self.log_test("Portfolio Bundle", False, f"HTTP {response.status_code}: {response.text}")
+
+        except httpx.HTTPError as e:
+            self.log_test("Portfolio Bundle", False, f"Connection error: {str(e)}")
+
+    async def test_server_render(self):
+        """Test GET /api/render returns a complete HTML page"""
+        try:
+            response = await self.request("GET", "/render")
+
+            if response.status_code == 200 and response.headers.get("content-type", "").startswith("text/html"):
+                page = response.text
+                if all(section in page for section in ['id="projects"', 'id="skills"', 'id="contact"']):
+                    self.log_test("Server Render", True, f"Rendered {len(page)} bytes of HTML")
+                else:
+                    self.log_test("Server Render", False, "Rendered page is missing sections")
+            else:
+                self.log_test("Server Render", False, f"HTTP {response.status_code}: {response.text[:200]}")
+
+        except httpx.HTTPError as e:
+            self.log_test("Server Render", False, f"Connection error: {str(e)}")
+
+    async def test_project_events(self):
+        """Test POST /api/events accepts beacons and featured projects can be ordered by popularity"""
+        try:
+            featured_response = await self.request("GET", "/projects/featured")
+            featured = featured_response.json() if featured_response.status_code == 200 else []
+            if not featured:
+                self.log_test("Project Events", False, "No featured projects to send events for")
+                return
+
+            # Beacons arrive as text/plain
+            events = [{"project_id": featured[-1]["id"], "type": "demo_click"}, {"project_id": featured[0]["id"], "type": "view"}]
+            response = await self.request("POST", "/events", content=json.dumps({"events": events}), headers={"Content-Type": "text/plain"})
+            invalid = await self.request("POST", "/events", json={"events": [{"project_id": "not-a-uuid", "type": "view"}]})
+            popular = await self.request("GET", "/projects/featured", params={"order": "popular"})
+
+            if response.status_code != 202:
+                self.log_test("Project Events", False, f"HTTP {response.status_code}: {response.text}")
+            elif invalid.status_code != 422:
+                self.log_test("Project Events", False, f"Expected 422 for invalid events, got HTTP {invalid.status_code}")
+            elif popular.status_code != 200 or sorted(p["id"] for p in popular.json()) != sorted(p["id"] for p in featured):
+                self.log_test("Project Events", False, f"Popular ordering returned HTTP {popular.status_code}")
+            else:
+                self.log_test("Project Events", True, f"Accepted {response.json()['data']['accepted']} events, popular ordering served")
+
+        except httpx.HTTPError as e:
+            self.log_test("Project Events", False, f"Connection error: {str(e)}")
+
+    async def test_contact_submission(self):
         """Test POST /api/contact with form data submission"""
-        print("\n5. Testing Contact Submission")
-        print("-" * 40)
-        
         # Test valid contact submission
         valid_contact_data = {
             "name": "John Smith",
@@ -214,15 +360,14 @@ class PortfolioAPITester:
             "subject": "Portfolio Inquiry",
             "message": "I'm interested in discussing a potential project collaboration. Your portfolio showcases impressive work!"
         }
-        
+
         try:
-            response = requests.post(
-                f"{self.api_url}/contact",
+            response = await self.request(
+                "POST", "/contact",
                 json=valid_contact_data,
                 headers={"Content-Type": "application/json"},
-                timeout=10
             )
-            
+
             if response.status_code == 200:
                 result = response.json()
                 if result.get('success') and 'message' in result:
@@ -231,40 +376,63 @@ class PortfolioAPITester:
                     self.log_test("Contact Submission (Valid)", False, "Invalid response structure")
             else:
                 self.log_test("Contact Submission (Valid)", False, f"HTTP {response.status_code}: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Contact Submission (Valid)", False, f"Connection error: {str(e)}")
-        
+
+        # Test that a repeated submission (modulo case and whitespace) is deduplicated
+        repeated_contact_data = {
+            **valid_contact_data,
+            "name": "  john SMITH ",
+            "message": valid_contact_data["message"].replace(" ", "  "),
+        }
+
+        try:
+            first, repeat = response, await self.request(
+                "POST", "/contact",
+                json=repeated_contact_data,
+                headers={"Content-Type": "application/json"},
+            )
+
+            if repeat.status_code == 200:
+                first_id = first.json().get('data', {}).get('id')
+                result = repeat.json()
+                if result.get('data', {}).get('id') == first_id and result['data'].get('duplicate'):
+                    self.log_test("Contact Submission (Duplicate)", True, f"Repeat returned existing id {first_id}")
+                else:
+                    self.log_test("Contact Submission (Duplicate)", False, f"Repeat was stored again: {result.get('data')}")
+            else:
+                self.log_test("Contact Submission (Duplicate)", False, f"HTTP {repeat.status_code}: {repeat.text}")
+
+        except httpx.HTTPError as e:
+            self.log_test("Contact Submission (Duplicate)", False, f"Connection error: {str(e)}")
+
         # Test invalid contact submission (missing required fields)
         invalid_contact_data = {
             "name": "Jane Doe",
             "email": "invalid-email"
             # Missing subject and message
         }
-        
+
         try:
-            response = requests.post(
-                f"{self.api_url}/contact",
+            response = await self.request(
+                "POST", "/contact",
                 json=invalid_contact_data,
                 headers={"Content-Type": "application/json"},
-                timeout=10
             )
-            
+
             if response.status_code == 422:  # Validation error expected
                 self.log_test("Contact Submission (Invalid)", True, "Properly rejected invalid data with 422 status")
             elif response.status_code == 400:  # Bad request also acceptable
                 self.log_test("Contact Submission (Invalid)", True, "Properly rejected invalid data with 400 status")
             else:
                 self.log_test("Contact Submission (Invalid)", False, f"Expected validation error, got HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Contact Submission (Invalid)", False, f"Connection error: {str(e)}")
-    
-    def test_data_validation(self):
+
+    async def test_data_validation(self):
         """Test data validation and field requirements"""
-        print("\n6. Testing Data Validation")
-        print("-" * 40)
-        
         # Test contact form with empty fields
         empty_contact = {
             "name": "",
@@ -272,23 +440,22 @@ class PortfolioAPITester:
             "subject": "",
             "message": ""
         }
-        
+
         try:
-            response = requests.post(
-                f"{self.api_url}/contact",
+            response = await self.request(
+                "POST", "/contact",
                 json=empty_contact,
                 headers={"Content-Type": "application/json"},
-                timeout=10
             )
-            
+
             if response.status_code in [400, 422]:
                 self.log_test("Data Validation (Empty Fields)", True, "Properly rejected empty fields")
             else:
                 self.log_test("Data Validation (Empty Fields)", False, f"Should reject empty fields, got HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Data Validation (Empty Fields)", False, f"Connection error: {str(e)}")
-        
+
         # Test contact form with invalid email
         invalid_email_contact = {
             "name": "Test User",
@@ -296,66 +463,77 @@ class PortfolioAPITester:
             "subject": "Test Subject",
             "message": "Test message content"
         }
-        
+
         try:
-            response = requests.post(
-                f"{self.api_url}/contact",
+            response = await self.request(
+                "POST", "/contact",
                 json=invalid_email_contact,
                 headers={"Content-Type": "application/json"},
-                timeout=10
             )
-            
+
             if response.status_code in [400, 422]:
                 self.log_test("Data Validation (Invalid Email)", True, "Properly rejected invalid email format")
             else:
                 self.log_test("Data Validation (Invalid Email)", False, f"Should reject invalid email, got HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Data Validation (Invalid Email)", False, f"Connection error: {str(e)}")
-    
-    def test_error_handling(self):
+
+    async def test_error_handling(self):
         """Test error responses for invalid requests"""
-        print("\n7. Testing Error Handling")
-        print("-" * 40)
-        
         # Test non-existent endpoint
         try:
-            response = requests.get(f"{self.api_url}/nonexistent", timeout=10)
-            
+            response = await self.request("GET", "/nonexistent")
+
             if response.status_code == 404:
                 self.log_test("Error Handling (404)", True, "Properly returns 404 for non-existent endpoint")
             else:
                 self.log_test("Error Handling (404)", False, f"Expected 404, got HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Error Handling (404)", False, f"Connection error: {str(e)}")
-        
+
         # Test malformed JSON in POST request
         try:
-            response = requests.post(
-                f"{self.api_url}/contact",
-                data="invalid json data",
+            response = await self.request(
+                "POST", "/contact",
+                content="invalid json data",
                 headers={"Content-Type": "application/json"},
-                timeout=10
             )
-            
+
             if response.status_code in [400, 422]:
                 self.log_test("Error Handling (Malformed JSON)", True, "Properly handles malformed JSON")
             else:
                 self.log_test("Error Handling (Malformed JSON)", False, f"Should reject malformed JSON, got HTTP {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Error Handling (Malformed JSON)", False, f"Connection error: {str(e)}")
-    
-    def test_database_integration(self):
+
+        # Test that admin endpoints refuse requests without valid credentials
+        try:
+            responses = await asyncio.gather(
+                self.request("GET", "/admin/slow-traces"),
+                self.request("GET", "/contacts"),
+                self.request("GET", "/contacts", headers={"Authorization": "Bearer not-a-token"}),
+                self.request("POST", "/auth/token", json={"username": "admin", "password": "wrong-password"}),
+            )
+            refused = [r for r in responses if r.status_code in [401, 403]]
+            response = next((r for r in responses if r.status_code not in [401, 403]), responses[0])
+
+            if len(refused) == len(responses):
+                self.log_test("Error Handling (Admin Unauthenticated)", True, f"Properly refused with {response.status_code} status")
+            else:
+                self.log_test("Error Handling (Admin Unauthenticated)", False, f"Expected 401/403, got HTTP {response.status_code}")
+
+        except httpx.HTTPError as e:
+            self.log_test("Error Handling (Admin Unauthenticated)", False, f"Connection error: {str(e)}")
+
+    async def test_database_integration(self):
         """Test database integration and data persistence"""
-        print("\n8. Testing Database Integration")
-        print("-" * 40)
-        
         # Test that contact submissions are saved (by checking admin endpoint)
         try:
-            response = requests.get(f"{self.api_url}/contacts", timeout=10)
-            
+            response = await self.request("GET", "/contacts", headers=await self.admin_headers())
+
             if response.status_code == 200:
                 contacts = response.json()
                 if isinstance(contacts, list):
@@ -364,51 +542,72 @@ class PortfolioAPITester:
                     self.log_test("Database Integration (Contacts)", False, "Invalid contacts data format")
             else:
                 self.log_test("Database Integration (Contacts)", False, f"HTTP {response.status_code}: {response.text}")
-                
-        except requests.exceptions.RequestException as e:
+
+        except httpx.HTTPError as e:
             self.log_test("Database Integration (Contacts)", False, f"Connection error: {str(e)}")
-        
+
         # Verify seeded data exists
         try:
             # Check projects count
-            projects_response = requests.get(f"{self.api_url}/projects", timeout=10)
-            skills_response = requests.get(f"{self.api_url}/skills", timeout=10)
-            
+            projects_response, skills_response = await asyncio.gather(
+                self.request("GET", "/projects"),
+                self.request("GET", "/skills"),
+            )
+
             projects_count = len(projects_response.json()) if projects_response.status_code == 200 else 0
-            
+
             skills_count = 0
             if skills_response.status_code == 200:
                 skills_data = skills_response.json()
                 skills_count = sum(len(skills) for skills in skills_data.values())
-            
+
             if projects_count > 0 and skills_count > 0:
                 self.log_test("Database Integration (Seeded Data)", True, f"Found {projects_count} projects and {skills_count} skills")
             else:
                 self.log_test("Database Integration (Seeded Data)", False, "Missing seeded data")
-                
+
         except Exception as e:
             self.log_test("Database Integration (Seeded Data)", False, f"Error checking seeded data: {str(e)}")
-    
-    def run_all_tests(self):
+
+    async def run_all_tests(self) -> bool:
         """Run all test suites"""
         print(f"Starting Portfolio Backend API Tests")
-        print(f"Backend URL: {self.api_url}")
         print("=" * 60)
-        
-        # Run all test suites
-        self.test_health_check()
-        self.test_projects_api()
-        self.test_skills_api()
-        self.test_contact_info_api()
-        self.test_contact_submission()
-        self.test_data_validation()
-        self.test_error_handling()
-        self.test_database_integration()
-        
+
+        # Independent checks run concurrently
+        await asyncio.gather(
+            self.test_health_check(),
+            self.test_projects_api(),
+            self.test_skills_api(),
+            self.test_skills_summary(),
+            self.test_contact_info_api(),
+            self.test_portfolio_bundle(),
+            self.test_server_render(),
+            self.test_project_events(),
+            self.test_data_validation(),
+            self.test_error_handling(),
+        )
+        # Persistence checks read back what the submission writes
+        await self.test_contact_submission()
+        await self.test_database_integration()
+
         # Print summary
-        self.print_summary()
-    
-    def print_summary(self):
+        return self.print_summary()
+
+    def timing_report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint latency summary, in milliseconds"""
+        report = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            report[endpoint] = {
+                "count": len(ordered),
+                "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+                "p50_ms": round(statistics.median(ordered) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+            }
+        return report
+
+    def print_summary(self) -> bool:
         """Print test summary"""
         print("\n" + "=" * 60)
         print("TEST SUMMARY")
@@ -417,7 +616,7 @@ class PortfolioAPITester:
         print(f"Passed: {self.passed_tests}")
         print(f"Failed: {self.total_tests - self.passed_tests}")
         print(f"Success Rate: {(self.passed_tests/self.total_tests)*100:.1f}%")
-        
+
         # Print failed tests
         failed_tests = [test for test in self.test_results if not test['passed']]
         if failed_tests:
@@ -425,24 +624,582 @@ class PortfolioAPITester:
             print("-" * 40)
             for test in failed_tests:
                 print(f"❌ {test['test']}: {test['details']}")
-        
+
         print("\n" + "=" * 60)
-        
+
         # Return success status
         return self.passed_tests == self.total_tests
 
+async def run_suite(
+    remote: bool = False, timing_path: Optional[str] = None, repeat: int = 1, fixtures: Optional[str] = None
+) -> bool:
+    """Run the suite `repeat` times; optionally write the latency report as JSON"""
+    if remote:
+        base_url = get_backend_url()
+        if not base_url:
+            raise Exception("Could not get backend URL from frontend/.env")
+        client = httpx.AsyncClient(base_url=base_url)
+    else:
+        client = await create_in_process_client(fixtures)
+
+    async with client:
+        tester = PortfolioAPITester(client)
+        started = time.perf_counter()
+        success = True
+        for _ in range(repeat):
+            success = await tester.run_all_tests() and success
+        elapsed = time.perf_counter() - started
+
+    print(f"Completed in {elapsed:.2f}s")
+    if timing_path:
+        report = {
+            "generated_at": datetime.now().isoformat(),
+            "target": "remote" if remote else "in-process",
+            "fixtures": fixtures,
+            "elapsed_s": round(elapsed, 3),
+            "endpoints": tester.timing_report(),
+        }
+        with open(timing_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Timing report written to {timing_path}")
+    return success
+
+def test_backend_api():
+    """pytest entry point: the whole suite, offline"""
+    assert asyncio.run(run_suite())
+
+# Focused checks of internals the HTTP suite cannot reach (pytest only)
+
+def test_logging_after_fork():
+    """A process forked after configure_logging() still writes its records"""
+    script = (
+        "import logging, os, sys\n"
+        "from structured_logging import configure_logging\n"
+        "configure_logging()\n"
+        "pid = os.fork()\n"
+        "if pid == 0:\n"
+        "    logging.getLogger('child').warning('logged from the forked child')\n"
+        "    sys.exit(0)\n"
+        "os.waitpid(pid, 0)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=Path(__file__).parent,
+        capture_output=True, text=True, timeout=30,
+    )
+    lines = [json.loads(line) for line in result.stderr.splitlines() if line.startswith("{")]
+    assert any(line["message"] == "logged from the forked child" for line in lines), result.stderr
+
+def test_shared_snapshot(tmp_path):
+    """Sections published to the mapped snapshot are served byte-for-byte, new versions are picked up"""
+    import database
+    import server
+    from models import Skill
+    from shared_snapshot import SharedSnapshotReader, SharedSnapshotWriter
+
+    sections = {
+        "/api/projects": "projects",
+        "/api/projects/featured": "featured_projects",
+        "/api/skills": "skills",
+        "/api/skills/summary": "skills_summary",
+        "/api/contact-info": "contact_info",
+    }
+    path = tmp_path / "portfolio.snapshot"
+
+    async def run():
+        client = await create_in_process_client()
+        reader = SharedSnapshotReader(path, source=server.SNAPSHOT_SOURCE, max_age=60, check_interval=0)
+        writer = SharedSnapshotWriter(path, source=server.SNAPSHOT_SOURCE)
+        saved = server.shared_snapshot, server.snapshot_writer
+        server.shared_snapshot, server.snapshot_writer = reader, writer
+        try:
+            async with client:
+                from_database = {url: (await client.get(url)).content for url in sections}
+
+                assert writer.try_acquire()
+                await server.publish_shared_snapshot()
+                for url in sections:
+                    response = await client.get(url)
+                    assert response.headers.get("x-snapshot-version") == str(reader.version), url
+                    assert response.content == from_database[url], url
+                first_version = reader.version
+
+                # A second version is renamed into place and picked up
+                await database.db.create_skill(Skill(name="Snapshot Skill", level=50, years=1, category="tools"))
+                await server.publish_shared_snapshot()
+                response = await client.get("/api/skills")
+                assert int(response.headers["x-snapshot-version"]) > first_version
+                assert "Snapshot Skill" in response.text
+
+                # An admin edit is republished at once by the lock holder
+                headers = await PortfolioAPITester(client).admin_headers()
+                skill_id = next(
+                    skill["id"] for skill in (await client.get("/api/skills")).json()["tools"]
+                    if skill["name"] == "Snapshot Skill"
+                )
+                version = reader.version
+                response = await client.patch(f"/api/skills/{skill_id}", json={"level": 100}, headers=headers)
+                assert response.status_code == 200
+                summary = await client.get("/api/skills/summary")
+                assert int(summary.headers["x-snapshot-version"]) > version
+                assert summary.json()["top_skills"][0]["name"] == "Snapshot Skill"
+
+                # The lock is handed over once the writer releases it
+                other = SharedSnapshotWriter(path, source=server.SNAPSHOT_SOURCE)
+                assert not other.try_acquire()
+                writer.release()
+                assert other.try_acquire()
+                other.release()
+
+                # Too old, or built from another database: read through instead
+                reader.max_age = 0
+                response = await client.get("/api/projects")
+                assert "x-snapshot-version" not in response.headers
+                reader.max_age = 60
+                foreign = SharedSnapshotReader(path, source="mongodb://elsewhere/other", check_interval=0)
+                assert foreign.get("projects") is None
+        finally:
+            writer.release()
+            server.shared_snapshot, server.snapshot_writer = saved
+
+    asyncio.run(run())
+
+def test_circuit_breaker_and_last_known_good():
+    """Slow reads hit the deadline, open the breaker, then fail fast; endpoints serve stale data"""
+    import database
+    from pymongo.errors import DuplicateKeyError
+    from resilience import CircuitBreaker, CircuitOpenError
+
+    class SlowCursor:
+        async def to_list(self, length=None):
+            await asyncio.sleep(10)
+
+    class SlowDatabase:
+        """Every collection's find() hangs well past the deadline"""
+        calls = 0
+
+        def __getattr__(self, name):
+            return self
+
+        def find(self, *args, **kwargs):
+            SlowDatabase.calls += 1
+            return SlowCursor()
+
+    async def run():
+        client = await create_in_process_client()
+        db = database.db
+        async with client:
+            fresh = await client.get("/api/projects")
+            assert fresh.status_code == 200
+
+            db.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+            db.operation_timeout = 0.05
+            db.read_db = SlowDatabase()
+
+            # Errors that are not about the database's health are not counted
+            async def duplicate():
+                raise DuplicateKeyError("E11000")
+            for _ in range(3):
+                try:
+                    await db._guarded(duplicate)
+                except DuplicateKeyError:
+                    pass
+            assert db.breaker.failures == 0
+
+            for _ in range(2):
+                started = time.perf_counter()
+                response = await client.get("/api/projects")
+                assert time.perf_counter() - started < 1.0
+                assert response.status_code == 200
+                assert response.headers.get("x-data-stale") == "true"
+                assert response.content == fresh.content
+            assert db.breaker.state == CircuitBreaker.OPEN
+            assert SlowDatabase.calls == 2
+
+            # Open: no call reaches the database
+            try:
+                await db.get_projects()
+                assert False, "expected CircuitOpenError"
+            except CircuitOpenError:
+                pass
+            response = await client.get("/api/projects")
+            assert response.headers.get("x-data-stale") == "true"
+            assert SlowDatabase.calls == 2
+
+    asyncio.run(run())
+
+def test_read_routing():
+    """Public reads go to the secondary-preferred handle; writes and admin reads to the primary"""
+    import database
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from pymongo.read_preferences import Primary, SecondaryPreferred
+
+    class Recording:
+        """Notes which handle each collection is taken from (the stand-in ignores read preferences)"""
+
+        def __init__(self, handle, name: str, log: List[tuple]):
+            self._handle, self._name, self._log = handle, name, log
+
+        def __getattr__(self, collection):
+            self._log.append((self._name, collection))
+            return getattr(self._handle, collection)
+
+    async def run():
+        # The real handles carry the read preferences
+        url = "mongodb://localhost:1"
+        real = database.Database(url, "routing", client=AsyncIOMotorClient(url, connect=False))
+        assert isinstance(real.db.read_preference, Primary)
+        assert isinstance(real.read_db.read_preference, SecondaryPreferred)
+        await real.close()
+
+        client = await create_in_process_client()
+        db = database.db
+        log: List[tuple] = []
+        db.db, db.read_db = Recording(db.db, "primary", log), Recording(db.read_db, "read", log)
+        async with client:
+            tester = PortfolioAPITester(client)
+            headers = await tester.admin_headers()
+
+            assert (await client.get("/api/projects")).status_code == 200
+            assert (await client.get("/api/contact-info")).status_code == 200
+            assert ("read", "projects") in log and ("read", "contact_info") in log
+            assert all(handle == "read" for handle, _ in log)
+
+            log.clear()
+            response = await client.post("/api/contact", json={
+                "name": "Routing Check", "email": "routing@example.com",
+                "subject": "Read routing", "message": "Written to the primary",
+            })
+            assert response.status_code == 200
+            assert ("primary", "contacts") in log and ("read", "contacts") not in log
+
+            log.clear()
+            response = await client.get("/api/contacts", headers=headers)
+            assert response.status_code == 200
+            assert any(contact["name"] == "Routing Check" for contact in response.json())
+            assert log == [("primary", "contacts")]
+
+    asyncio.run(run())
+
+def test_migrate_legacy_contacts():
+    """Legacy contacts without a content hash stay version 1 and get it computed on read"""
+    import uuid
+    from memory_mongo import MemoryMongoClient
+    from migrate import COLLECTIONS, migrate_collection
+    from models import contact_content_hash
+    from records import ContactRecord
+
+    async def run():
+        contacts = MemoryMongoClient()["legacy"].contacts
+        legacy = {"name": "Legacy", "email": "legacy@example.com", "subject": "Old", "message": "Before dedup"}
+        for _ in range(2):
+            await contacts.insert_one({"id": str(uuid.uuid4()), **legacy, "created_at": datetime.now()})
+        assert await migrate_collection(contacts, *COLLECTIONS["contacts"]) == 2
+        expected = contact_content_hash(*legacy.values())
+        for document in await contacts.find().to_list(length=None):
+            assert document["v"] == 1 and "h" not in document
+            assert ContactRecord.from_document(document).content_hash == expected
+
+    asyncio.run(run())
+
+def test_project_events_flush():
+    """Flushed event counts land in project_events and drive the popular ordering"""
+    import uuid
+    import database
+    import server
+    from pymongo.errors import AutoReconnect
+
+    async def run():
+        # Whatever earlier tests left pending belongs to their database
+        await server.event_aggregator.flush()
+        client = await create_in_process_client()
+        async with client:
+            featured = (await client.get("/api/projects/featured")).json()
+            clicked, viewed = featured[-1]["id"], featured[0]["id"]
+            events = (
+                [{"project_id": clicked, "type": "demo_click"}] * 2
+                + [{"project_id": clicked, "type": "github_click"}]
+                + [{"project_id": viewed, "type": "view"}] * 3
+                + [{"project_id": str(uuid.uuid4()), "type": "view"}]
+            )
+            response = await client.post("/api/events", content=json.dumps({"events": events}))
+            assert response.status_code == 202
+            assert await server.event_aggregator.flush() == 3
+
+            popular = (await client.get("/api/projects/featured", params={"order": "popular"})).json()
+            assert [project["id"] for project in popular[:2]] == [clicked, viewed]
+
+            stored = await database.db.db.project_events.find().to_list(length=None)
+            counts = {str(document["p"]): document["c"] for document in stored}
+            assert counts == {clicked: {"demo_click": 2, "github_click": 1}, viewed: {"view": 3}}
+
+            # The totals fail after the per-bucket counts were written: the
+            # retry must not add the bucket counts a second time
+            popularity = database.db.db.project_popularity
+            write_totals = popularity.bulk_write
+
+            async def fail_once(*args, **kwargs):
+                popularity.bulk_write = write_totals
+                raise AutoReconnect("connection reset")
+
+            popularity.bulk_write = fail_once
+            await client.post("/api/events", json={"events": [{"project_id": viewed, "type": "view"}]})
+            try:
+                await server.event_aggregator.flush()
+                assert False, "expected AutoReconnect"
+            except AutoReconnect:
+                pass
+            assert await server.event_aggregator.flush() == 1
+            assert await server.event_aggregator.flush() == 0
+
+            stored = await database.db.db.project_events.find({"p": uuid.UUID(viewed)}).to_list(length=None)
+            assert [document["c"] for document in stored] == [{"view": 4}]
+            totals = await popularity.find_one({"_id": uuid.UUID(viewed)})
+            assert totals["v"] == 4
+
+    asyncio.run(run())
+
+def test_event_flush_retry():
+    """A cancelled flush is retried as is, with its flush id, and counts toward the cap"""
+    from analytics import EventAggregator
+    from models import ProjectEvent
+
+    attempts, written = [], []
+    hang = True
+
+    async def flush(counts, flush_id):
+        attempts.append(flush_id)
+        if hang:
+            await asyncio.sleep(10)
+        written.append((flush_id, counts))
+
+    def event(project_id: str) -> ProjectEvent:
+        return ProjectEvent(project_id=project_id, type="view")
+
+    async def run():
+        nonlocal hang
+        aggregator = EventAggregator(flush, max_pending=2)
+        aggregator.record([event("3f0b8a52-6a43-4a0e-9c4c-5d3a1c0e2b71")])
+        flushing = asyncio.create_task(aggregator.flush())
+        await asyncio.sleep(0)
+        flushing.cancel()
+        try:
+            await flushing
+        except asyncio.CancelledError:
+            pass
+        assert aggregator.pending == 1
+
+        # The batch awaiting retry takes up room under max_pending
+        aggregator.record([event("5c1e7d0a-2b9f-4f3e-8a6d-0e4b2c9d1f55"), event("9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d")])
+        assert (aggregator.pending, aggregator.dropped) == (2, 1)
+
+        hang = False
+        assert await aggregator.flush() == 2
+        (retried_id, retried), (newer_id, newer) = written
+        assert retried_id == attempts[0] != newer_id
+        assert [str(project_id) for project_id, _ in retried] == ["3f0b8a52-6a43-4a0e-9c4c-5d3a1c0e2b71"]
+        assert [str(project_id) for project_id, _ in newer] == ["5c1e7d0a-2b9f-4f3e-8a6d-0e4b2c9d1f55"]
+        assert aggregator.pending == 0
+
+    asyncio.run(run())
+
+def test_dump_restore_round_trip(tmp_path):
+    """A chunked dump restores into a fresh database document-for-document"""
+    import database
+    from datactl import dump_database, read_manifest, restore_database
+    from memory_mongo import MemoryMongoClient
+
+    def normalized(documents):
+        # BSON dates keep milliseconds; the in-memory stand-in keeps microseconds
+        def value(v):
+            if isinstance(v, datetime):
+                return v.replace(microsecond=v.microsecond // 1000 * 1000)
+            if isinstance(v, dict):
+                return {key: value(item) for key, item in v.items()}
+            if isinstance(v, list):
+                return [value(item) for item in v]
+            return v
+        return sorted((value(document) for document in documents), key=lambda d: str(d["_id"]))
+
+    async def run():
+        client = await create_in_process_client()
+        await client.aclose()
+        source = database.db
+        manifest = await dump_database(source, tmp_path, batch_size=3, chunk_size=4)
+        assert read_manifest(tmp_path) == manifest
+
+        target = database.Database("memory://", "restored", client=MemoryMongoClient())
+        restored = await restore_database(target, tmp_path, batch_size=2)
+        for name, entry in manifest["collections"].items():
+            documents = await source.db[name].find().to_list(length=None)
+            assert entry["documents"] == len(documents) == restored[name], name
+            assert len(entry["chunks"]) == -(-len(documents) // 4), name
+            copy = await target.db[name].find().to_list(length=None)
+            assert normalized(copy) == normalized(documents), name
+        assert manifest["collections"]["projects"]["documents"] > 4
+
+        # A non-empty target is refused unless dropped first
+        try:
+            await restore_database(target, tmp_path)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert "not empty" in str(e)
+        assert await restore_database(target, tmp_path, drop=True) == restored
+
+    asyncio.run(run())
+
+def test_skills_summary_maintenance():
+    """The stored summary matches a full rebuild after skills are created and edited"""
+    import uuid
+    import database
+    import skills_summary
+    from models import Skill, utc_now
+
+    async def rebuilt(db):
+        skills = await db.db.skills.find().to_list(length=None)
+        document = skills_summary.summarize(skills, utc_now())
+        stored = await db.db.skills_summary.find_one({"_id": skills_summary.SUMMARY_ID})
+        document.pop("ua"), stored.pop("ua")
+        return stored, document
+
+    async def run():
+        client = await create_in_process_client()
+        db = database.db
+        async with client:
+            headers = await PortfolioAPITester(client).admin_headers()
+            created = [
+                Skill(name=f"Summary Skill {i}", level=98 + i, years=i, category=category)
+                for i, category in enumerate(["tools", "design", "tools"])
+            ]
+            for skill in created:
+                await db.create_skill(skill)
+            stored, expected = await rebuilt(db)
+            assert stored == expected
+            assert stored["top"][0]["name"] == "Summary Skill 2"
+
+            # Moving the top skill to another category and down the ranking
+            response = await client.patch(
+                f"/api/skills/{created[2].id}", json={"level": 5, "category": "backend"}, headers=headers
+            )
+            assert response.status_code == 200
+            stored, expected = await rebuilt(db)
+            assert stored == expected
+            assert all(entry["name"] != "Summary Skill 2" for entry in stored["top"])
+
+            summary = (await client.get("/api/skills/summary")).json()
+            assert summary["top_skills"][0]["name"] == "Summary Skill 1"
+
+            missing = await client.patch(f"/api/skills/{uuid.uuid4()}", json={"level": 1}, headers=headers)
+            invalid = await client.patch("/api/skills/not-a-uuid", json={"level": 1}, headers=headers)
+            unauthenticated = await client.patch(f"/api/skills/{created[0].id}", json={"level": 1})
+            assert (missing.status_code, invalid.status_code) == (404, 404)
+            assert unauthenticated.status_code in (401, 403)
+
+    asyncio.run(run())
+
+def test_profiling_endpoints():
+    """The profiler returns collapsed stacks, one session at a time; slow requests leave traces"""
+    import re
+    import database
+    import server
+
+    class BlockingDatabase:
+        """find() on any collection returns `documents` after holding the event loop"""
+
+        def __init__(self, documents):
+            self.documents = documents
+
+        def __getattr__(self, name):
+            return self
+
+        def find(self, *args, **kwargs):
+            return self
+
+        async def to_list(self, length=None):
+            time.sleep(0.3)  # as a CPU-bound handler would
+            return self.documents
+
+    async def run():
+        client = await create_in_process_client()
+        db = database.db
+        async with client:
+            headers = await PortfolioAPITester(client).admin_headers()
+
+            first, second = await asyncio.gather(
+                client.post("/api/admin/profile", params={"seconds": 0.2}, headers=headers),
+                client.post("/api/admin/profile", params={"seconds": 0.2}, headers=headers),
+            )
+            assert sorted([first.status_code, second.status_code]) == [200, 409]
+            profile = first if first.status_code == 200 else second
+            lines = profile.text.splitlines()
+            assert lines and all(re.fullmatch(r".+;.+ \d+", line) for line in lines), profile.text
+
+            projects = await db.read_db.projects.find().to_list(length=None)
+            saved = server.slow_request_tracer.threshold, db.read_db
+            server.slow_request_tracer.threshold = 0.02
+            db.read_db = BlockingDatabase(projects)
+            try:
+                request_id = secrets.token_hex(8)
+                response = await client.get("/api/projects", headers={"X-Request-ID": request_id})
+                assert response.status_code == 200
+            finally:
+                server.slow_request_tracer.threshold, db.read_db = saved
+
+            traces = (await client.get("/api/admin/slow-traces", headers=headers)).json()["traces"]
+            trace = next(trace for trace in traces if trace["request_id"] == request_id)
+            assert trace["route"] == "/api/projects" and trace["duration_ms"] >= 300
+            assert "to_list (backend_test.py" in trace["stacks"]
+
+    asyncio.run(run())
+
+def test_contact_dedup_window():
+    """Repeats across a bucket boundary are deduplicated; the hash is not exposed"""
+    from datetime import timedelta, timezone
+    import database
+    from models import Contact
+
+    async def run():
+        client = await create_in_process_client()
+        db = database.db
+        window = database.CONTACT_DEDUP_WINDOW_SECONDS
+        boundary = datetime.fromtimestamp((time.time() // window + 1) * window, timezone.utc)
+        submission = {"name": "Edge", "email": "edge@example.com", "subject": "Boundary", "message": "Twice"}
+
+        def at(seconds: float) -> Contact:
+            return Contact(**submission, created_at=boundary + timedelta(seconds=seconds))
+
+        first = await db.create_contact(at(-1))
+        assert await db.create_contact(at(1)) == first
+        assert await db.create_contact(at(window - 2)) == first
+        assert await db.create_contact(at(window + 1)) != first
+
+        async with client:
+            headers = await PortfolioAPITester(client).admin_headers()
+            contacts = (await client.get("/api/contacts", headers=headers)).json()
+        assert sum(contact["name"] == "Edge" for contact in contacts) == 2
+        assert all("content_hash" not in contact for contact in contacts)
+
+    asyncio.run(run())
+
 def main():
     """Main test execution"""
+    parser = argparse.ArgumentParser(description="Portfolio backend API tests")
+    parser.add_argument("--remote", action="store_true", help="Test the deployed backend instead of running in-process")
+    parser.add_argument("--timing", metavar="PATH", help="Write per-endpoint latency as JSON")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the suite this many times (more latency samples)")
+    parser.add_argument("--fixtures", metavar="DIR", help="Load the in-process database from a datactl.py dump instead of the mocks")
+    args = parser.parse_args()
+    if args.remote and args.fixtures:
+        parser.error("--fixtures only applies to in-process runs")
+
     try:
-        tester = PortfolioAPITester()
-        success = tester.run_all_tests()
-        
+        success = asyncio.run(run_suite(args.remote, args.timing, args.repeat, args.fixtures))
+
         # Exit with appropriate code
         sys.exit(0 if success else 1)
-        
+
     except Exception as e:
         print(f"Error running tests: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of admin authentication
+
+Times `require_admin` for a token seen before (claims LRU hit) and for a
+fresh token (full HS256 signature check), and the password check behind
+`POST /api/auth/token`, which runs in the thread pool rather than on the
+event loop. Per-request overhead should stay under a millisecond.
+
+    python benchmarks/auth.py --iterations 20000
+"""
+
+from typing import Dict, List
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import secrets
+import statistics
+import sys
+import time
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ.setdefault("JWT_SECRET", secrets.token_hex(32))
+
+from passlib.hash import pbkdf2_sha256  # noqa: E402
+
+import auth  # noqa: E402
+
+BUDGET_MS = 1.0
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50_us": statistics.median(ordered) * 1e6,
+        "p99_us": ordered[int(len(ordered) * 0.99) - 1] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+async def time_require_admin(header: str, iterations: int, cold: bool) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        if cold:
+            auth.verified_tokens.clear()
+        started = time.perf_counter()
+        await auth.require_admin(header)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def time_password_check(password: str, iterations: int) -> List[float]:
+    os.environ["ADMIN_PASSWORD_HASH"] = pbkdf2_sha256.hash(password)
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        assert await auth.authenticate(os.environ.get("ADMIN_USERNAME", "admin"), password)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def run(iterations: int) -> bool:
+    token, _ = auth.issue_token("admin")
+    header = f"Bearer {token}"
+    results = {
+        "cached token": percentiles(await time_require_admin(header, iterations, cold=False)),
+        "fresh token": percentiles(await time_require_admin(header, iterations, cold=True)),
+    }
+
+    print(f"{'case':<16} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    for name, result in results.items():
+        print(f"{name:<16} {result['p50_us']:>9.1f} {result['p99_us']:>9.1f} {result['max_us']:>9.1f}")
+
+    login = percentiles(await time_password_check(secrets.token_urlsafe(16), 20))
+    print(f"{'password check':<16} {login['p50_us']:>9.1f} {login['p99_us']:>9.1f} {login['max_us']:>9.1f}"
+          "  (thread pool, token endpoint only)")
+
+    within_budget = all(result["p99_us"] < BUDGET_MS * 1000 for result in results.values())
+    print(f"p99 per-request overhead {'within' if within_budget else 'OVER'} the {BUDGET_MS:g} ms budget")
+    return within_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(run(args.iterations)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Throughput comparison of the launcher profiles
+
+Starts `launcher.py` once per profile, drives it with concurrent keep-alive
+clients for a fixed duration and reports requests/second and latency
+percentiles. MONGO_URL and DB_NAME must be set for endpoints that read data;
+the health check (the default path) does not touch the database.
+
+    python benchmarks/launch_profiles.py --profiles dev,uvicorn,gunicorn --path /api/projects
+"""
+
+from typing import Dict, List
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+async def wait_until_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+async def drive(url: str, concurrency: int, duration: float) -> List[float]:
+    """Issue requests from `concurrency` clients for `duration` seconds"""
+    latencies: List[float] = []
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits) as client:
+        async def worker():
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                response = await client.get(url)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def summarize(latencies: List[float], duration: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "rps": len(ordered) / duration,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[int(len(ordered) * 0.99) - 1] * 1000,
+    }
+
+
+def bench_profile(profile: str, args) -> Dict[str, float]:
+    command = [sys.executable, "launcher.py", "--profile", profile, "--host", "127.0.0.1", "--port", str(args.port)]
+    if args.workers and profile != "dev":
+        command += ["--workers", str(args.workers)]
+    process = subprocess.Popen(
+        command, cwd=ROOT_DIR, env=os.environ.copy(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{args.port}{args.path}"
+        asyncio.run(wait_until_ready(url))
+        # Warm up caches and connections before measuring
+        asyncio.run(drive(url, args.concurrency, 1.0))
+        latencies = asyncio.run(drive(url, args.concurrency, args.duration))
+        return summarize(latencies, args.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="dev,uvicorn,gunicorn")
+    parser.add_argument("--path", default="/api/")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'requests':>9} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for profile in args.profiles.split(","):
+        result = bench_profile(profile, args)
+        print(f"{profile:<10} {result['requests']:>9} {result['rps']:>10.0f} "
+              f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
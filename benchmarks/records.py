@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Memory and construction time of read records versus Pydantic models
+
+Builds the same stored documents into the Pydantic models (the former read
+path, `schema.from_document`) and into the slots-based records, and reports
+construction time and retained memory per object. No database is needed.
+
+    python benchmarks/records.py --count 50000
+"""
+
+from typing import Callable, Dict, List
+from pathlib import Path
+import argparse
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from models import Project, Skill, Contact, SkillCategory  # noqa: E402
+from records import ProjectRecord, SkillRecord, ContactRecord  # noqa: E402
+from schema import (  # noqa: E402
+    PROJECT_FIELDS, SKILL_FIELDS, CONTACT_FIELDS, to_document, from_document
+)
+
+
+def sample_documents(count: int) -> Dict[str, List[dict]]:
+    return {
+        "projects": [
+            to_document(Project(
+                title=f"Project {i}",
+                description="A portfolio project used to size read records. " * 4,
+                image="https://example.com/image.png",
+                technologies=["React", "FastAPI", "MongoDB"],
+                category="Web Development",
+                demo_url="https://example.com/demo",
+                featured=i % 3 == 0,
+            ), PROJECT_FIELDS)
+            for i in range(count)
+        ],
+        "skills": [
+            to_document(Skill(
+                name=f"Skill {i}", level=i % 101, years=i % 15,
+                category=list(SkillCategory)[i % 4],
+            ), SKILL_FIELDS)
+            for i in range(count)
+        ],
+        "contacts": [
+            to_document(Contact(
+                name=f"Visitor {i}", email=f"visitor{i}@example.com",
+                subject="Project inquiry", message="I would like to talk about a project. " * 3,
+            ), CONTACT_FIELDS)
+            for i in range(count)
+        ],
+    }
+
+
+def measure(build: Callable[[dict], object], documents: List[dict]) -> Dict[str, float]:
+    started = time.perf_counter()
+    objects = [build(document) for document in documents]
+    elapsed = time.perf_counter() - started
+    del objects
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    objects = [build(document) for document in documents]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del objects
+    return {
+        "us_per_object": elapsed / len(documents) * 1e6,
+        "bytes_per_object": retained / len(documents),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20000, help="documents per collection")
+    args = parser.parse_args()
+
+    documents = sample_documents(args.count)
+    cases = {
+        "projects": (Project, PROJECT_FIELDS, ProjectRecord),
+        "skills": (Skill, SKILL_FIELDS, SkillRecord),
+        "contacts": (Contact, CONTACT_FIELDS, ContactRecord),
+    }
+
+    print(f"{'collection':<10} {'type':<8} {'us/object':>10} {'bytes/object':>13}")
+    for name, (model, fields, record) in cases.items():
+        results = {
+            "model": measure(lambda document: from_document(document, model, fields), documents[name]),
+            "record": measure(record.from_document, documents[name]),
+        }
+        for kind, result in results.items():
+            print(f"{name:<10} {kind:<8} {result['us_per_object']:>10.2f} {result['bytes_per_object']:>13.0f}")
+        print(
+            f"{'':<10} {'ratio':<8} "
+            f"{results['model']['us_per_object'] / results['record']['us_per_object']:>9.1f}x "
+            f"{results['model']['bytes_per_object'] / results['record']['bytes_per_object']:>12.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,151 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import List, Dict, Optional
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.read_preferences import SecondaryPreferred
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple, TypeVar
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
 import os
-from models import Project, Skill, Contact, ContactInfo, SkillCategory
+import uuid
+from models import (
+    Project, Skill, SkillUpdate, Contact, ContactInfo, SkillCategory, SkillsSummary,
+    contact_content_hash, utc_now
+)
+from resilience import CircuitBreaker
+from analytics import PendingCounts
+from structured_logging import record_db_time
+from schema import (
+    PROJECT_FIELDS, SKILL_FIELDS, CONTACT_FIELDS, CONTACT_INFO_FIELDS,
+    to_document, from_document
+)
+from records import ProjectRecord, SkillRecord, ContactRecord
+import skills_summary
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Smallest value MongoDB accepts for maxStalenessSeconds
+DEFAULT_MAX_STALENESS_SECONDS = 90
+# Deadline for a single database call, in seconds
+DEFAULT_OPERATION_TIMEOUT = 2.0
+# Seeding, migration and dumps build indexes and stream whole collections
+MAINTENANCE_OPERATION_TIMEOUT = 3600.0
+# Identical contact submissions within the same window of this many seconds
+# are stored once
+CONTACT_DEDUP_WINDOW_SECONDS = int(os.environ.get('CONTACT_DEDUP_WINDOW_SECONDS', 600))
+# Event flush ids remembered per counter document; a failed flush must be
+# retried before this many other flushes have touched the same document
+RECENT_FLUSHES = 64
+DUPLICATE_KEY = 11000
+
+# Every collection the Database methods read or write
+COLLECTIONS = (
+    "projects",
+    "skills",
+    "skills_summary",
+    "contacts",
+    "contact_info",
+    "project_events",
+    "project_popularity",
+)
+
 class Database:
-    def __init__(self, mongo_url: str, db_name: str):
-        self.client = AsyncIOMotorClient(mongo_url)
+    def __init__(
+        self,
+        mongo_url: str,
+        db_name: str,
+        client: Optional[AsyncIOMotorClient] = None,
+        max_staleness_seconds: int = DEFAULT_MAX_STALENESS_SECONDS,
+        operation_timeout: float = DEFAULT_OPERATION_TIMEOUT,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        # A pre-built client (e.g. a stand-in for tests) may be injected.
+        # Binary UUIDs (subtype 4) and timezone-aware UTC datetimes
+        self.client = client or AsyncIOMotorClient(
+            mongo_url,
+            uuidRepresentation="standard",
+            tz_aware=True,
+            tzinfo=timezone.utc,
+            # Driver-side deadline so executor threads give up as well
+            timeoutMS=int(operation_timeout * 1000),
+        )
+        # Writes and seeding go to the primary
         self.db = self.client[db_name]
+        # Read endpoints are served by secondaries when they are fresh enough
+        self.read_db = self.client.get_database(
+            db_name,
+            read_preference=SecondaryPreferred(max_staleness=max_staleness_seconds),
+        )
+        # Every request-path call runs under a deadline and the breaker
+        self.operation_timeout = operation_timeout
+        self.breaker = breaker or CircuitBreaker()
         
     async def close(self):
         self.client.close()
 
+    async def _guarded(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Run a database call under the deadline and circuit breaker"""
+        started = time.perf_counter()
+        try:
+            return await self.breaker.call(operation, timeout=self.operation_timeout)
+        finally:
+            record_db_time(time.perf_counter() - started)
+
+    async def ensure_indexes(self):
+        """Create the secondary indexes used by the read paths"""
+        try:
+            await self.db.projects.create_index([("f", ASCENDING)])
+            await self.db.skills.create_index([("cat", ASCENDING)])
+            await self.db.contacts.create_index([("ca", DESCENDING)])
+            # Content hash + time bucket; documents from before deduplication have neither
+            await self.db.contacts.create_index(
+                [("h", ASCENDING), ("b", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"h": {"$exists": True}},
+            )
+            await self.db.project_events.create_index(
+                [("p", ASCENDING), ("b", ASCENDING)], unique=True
+            )
+        except Exception as e:
+            logger.error("Error creating indexes: %s", e)
+            raise
+
     # Project operations
-    async def get_projects(self) -> List[Project]:
+    async def get_projects(self) -> List[ProjectRecord]:
         """Get all projects"""
         try:
-            cursor = self.db.projects.find()
-            projects = await cursor.to_list(length=None)
-            return [Project(**project) for project in projects]
+            projects = await self._guarded(
+                lambda: self.read_db.projects.find().to_list(length=None)
+            )
+            return [ProjectRecord.from_document(project) for project in projects]
         except Exception as e:
-            logger.error(f"Error getting projects: {e}")
-            return []
+            logger.error("Error getting projects: %s", e)
+            raise
 
-    async def get_featured_projects(self) -> List[Project]:
+    async def get_featured_projects(self) -> List[ProjectRecord]:
         """Get featured projects only"""
         try:
-            cursor = self.db.projects.find({"featured": True})
-            projects = await cursor.to_list(length=None)
-            return [Project(**project) for project in projects]
+            projects = await self._guarded(
+                lambda: self.read_db.projects.find({"f": True}).to_list(length=None)
+            )
+            return [ProjectRecord.from_document(project) for project in projects]
         except Exception as e:
-            logger.error(f"Error getting featured projects: {e}")
-            return []
+            logger.error("Error getting featured projects: %s", e)
+            raise
 
     async def create_project(self, project: Project) -> str:
         """Create a new project"""
         try:
-            project_dict = project.dict()
-            result = await self.db.projects.insert_one(project_dict)
+            project_doc = to_document(project, PROJECT_FIELDS)
+            result = await self._guarded(
+                lambda: self.db.projects.insert_one(project_doc)
+            )
             return project.id
         except Exception as e:
-            logger.error(f"Error creating project: {e}")
+            logger.error("Error creating project: %s", e)
             raise
 
     async def seed_projects(self, projects: List[Project]):
@@ -55,20 +158,21 @@ class Database:
                 return
             
             # Insert projects
-            project_dicts = [project.dict() for project in projects]
-            await self.db.projects.insert_many(project_dicts)
-            logger.info(f"Seeded {len(projects)} projects")
+            project_docs = [to_document(project, PROJECT_FIELDS) for project in projects]
+            await self.db.projects.insert_many(project_docs)
+            logger.info("Seeded %s projects", len(projects))
         except Exception as e:
-            logger.error(f"Error seeding projects: {e}")
+            logger.error("Error seeding projects: %s", e)
             raise
 
     # Skill operations
-    async def get_skills(self) -> Dict[str, List[Skill]]:
+    async def get_skills(self) -> Dict[str, List[SkillRecord]]:
         """Get all skills grouped by category"""
         try:
-            cursor = self.db.skills.find()
-            skills = await cursor.to_list(length=None)
-            skills_objects = [Skill(**skill) for skill in skills]
+            skills = await self._guarded(
+                lambda: self.read_db.skills.find().to_list(length=None)
+            )
+            skills_objects = [SkillRecord.from_document(skill) for skill in skills]
             
             # Group by category
             grouped = {
@@ -84,17 +188,57 @@ class Database:
                     
             return grouped
         except Exception as e:
-            logger.error(f"Error getting skills: {e}")
-            return {"frontend": [], "backend": [], "design": [], "tools": []}
+            logger.error("Error getting skills: %s", e)
+            raise
 
     async def create_skill(self, skill: Skill) -> str:
         """Create a new skill"""
         try:
-            skill_dict = skill.dict()
-            result = await self.db.skills.insert_one(skill_dict)
+            skill_doc = to_document(skill, SKILL_FIELDS)
+            entry = skills_summary.skill_entry(
+                skill_doc["_id"], skill.name, skill_doc["cat"], skill.level, skill.years
+            )
+            result = await self._guarded(
+                lambda: self.db.skills.insert_one(skill_doc)
+            )
+            # Fold the new skill into the summary instead of rebuilding it
+            summary = await self._guarded(
+                lambda: self.db.skills_summary.update_one(
+                    {"_id": skills_summary.SUMMARY_ID},
+                    skills_summary.incremental_update(entry, skill.created_at)
+                )
+            )
+            if summary.matched_count == 0:
+                await self.recompute_skills_summary()
             return skill.id
         except Exception as e:
-            logger.error(f"Error creating skill: {e}")
+            logger.error("Error creating skill: %s", e)
+            raise
+
+    async def update_skill(self, skill_id: str, update: SkillUpdate) -> bool:
+        """Apply a partial update to a skill; False if it does not exist"""
+        try:
+            key = {"_id": uuid.UUID(skill_id)}
+        except ValueError:
+            return False
+        try:
+            changes = {
+                SKILL_FIELDS[name]: getattr(value, "value", value)
+                for name, value in update.dict(exclude_none=True).items()
+            }
+            if not changes:
+                return await self._guarded(lambda: self.db.skills.count_documents(key)) > 0
+            result = await self._guarded(
+                lambda: self.db.skills.update_one(key, {"$set": changes})
+            )
+            if result.matched_count == 0:
+                return False
+            # An edit can move a skill out of a category or a top list, which
+            # the incremental path cannot express: rebuild in bulk instead
+            await self.recompute_skills_summary()
+            return True
+        except Exception as e:
+            logger.error("Error updating skill: %s", e)
             raise
 
     async def seed_skills(self, skills: List[Skill]):
@@ -107,56 +251,221 @@ class Database:
                 return
             
             # Insert skills
-            skill_dicts = [skill.dict() for skill in skills]
-            await self.db.skills.insert_many(skill_dicts)
-            logger.info(f"Seeded {len(skills)} skills")
+            skill_docs = [to_document(skill, SKILL_FIELDS) for skill in skills]
+            await self.db.skills.insert_many(skill_docs)
+            await self.recompute_skills_summary()
+            logger.info("Seeded %s skills", len(skills))
+        except Exception as e:
+            logger.error("Error seeding skills: %s", e)
+            raise
+
+    async def recompute_skills_summary(self) -> dict:
+        """Rebuild the materialized skills summary from every skill"""
+        try:
+            skills = await self._guarded(
+                lambda: self.db.skills.find({}, {"n": 1, "l": 1, "y": 1, "cat": 1}).to_list(length=None)
+            )
+            document = skills_summary.summarize(skills, utc_now())
+            await self._guarded(
+                lambda: self.db.skills_summary.replace_one(
+                    {"_id": skills_summary.SUMMARY_ID}, document, upsert=True
+                )
+            )
+            return document
         except Exception as e:
-            logger.error(f"Error seeding skills: {e}")
+            logger.error("Error recomputing skills summary: %s", e)
+            raise
+
+    async def get_skills_summary(self) -> SkillsSummary:
+        """Get the precomputed skills summary (one document read)"""
+        try:
+            document = await self._guarded(
+                lambda: self.read_db.skills_summary.find_one({"_id": skills_summary.SUMMARY_ID})
+            )
+            if document is None:
+                # Databases seeded or migrated before the summary existed
+                document = await self.recompute_skills_summary()
+            return SkillsSummary(**skills_summary.to_response(document))
+        except Exception as e:
+            logger.error("Error getting skills summary: %s", e)
             raise
 
     # Contact operations
     async def create_contact(self, contact: Contact) -> str:
-        """Create a new contact submission"""
+        """Create a new contact submission
+
+        Returns the id of the stored submission, which is that of an
+        earlier identical one if it was made less than
+        CONTACT_DEDUP_WINDOW_SECONDS ago.
+        """
         try:
-            contact_dict = contact.dict()
-            result = await self.db.contacts.insert_one(contact_dict)
+            if contact.content_hash is None:
+                contact.content_hash = contact_content_hash(
+                    contact.name, contact.email, contact.subject, contact.message
+                )
+            contact_doc = to_document(contact, CONTACT_FIELDS)
+            content_hash = contact_doc.pop("h")
+            contact_doc["b"] = int(contact.created_at.timestamp()) // CONTACT_DEDUP_WINDOW_SECONDS
+            window_start = contact_doc["ca"] - timedelta(seconds=CONTACT_DEDUP_WINDOW_SECONDS)
+            # Insert-if-absent in one round-trip: the filter matches a copy
+            # from the last window whichever bucket it is in, the unique
+            # (h, b) index rejects a concurrent one, and the pre-image tells
+            # us whether a copy existed.
+            async def upsert():
+                return await self.db.contacts.find_one_and_update(
+                    {"h": content_hash, "ca": {"$gt": window_start}},
+                    {"$setOnInsert": contact_doc}, projection={"_id": 1}, upsert=True
+                )
+            try:
+                existing = await self._guarded(upsert)
+            except DuplicateKeyError:
+                # A concurrent identical submission won the insert
+                existing = await self._guarded(upsert)
+            if existing is not None:
+                return str(existing["_id"])
             return contact.id
         except Exception as e:
-            logger.error(f"Error creating contact: {e}")
+            logger.error("Error creating contact: %s", e)
             raise
 
-    async def get_contacts(self) -> List[Contact]:
-        """Get all contact submissions"""
+    async def get_contacts(self) -> List[ContactRecord]:
+        """Get all contact submissions
+
+        Read from the primary, so admins see every write at once whichever
+        worker made it; secondaries may lag by MONGO_MAX_STALENESS_SECONDS.
+        """
         try:
-            cursor = self.db.contacts.find().sort("created_at", -1)
-            contacts = await cursor.to_list(length=None)
-            return [Contact(**contact) for contact in contacts]
+            contacts = await self._guarded(
+                lambda: self.db.contacts.find().sort("ca", -1).to_list(length=None)
+            )
+            return [ContactRecord.from_document(contact) for contact in contacts]
         except Exception as e:
-            logger.error(f"Error getting contacts: {e}")
-            return []
+            logger.error("Error getting contacts: %s", e)
+            raise
+
+    # Analytics operations
+    async def record_project_events(self, counts: PendingCounts, flush_id: uuid.UUID):
+        """Add pre-aggregated event counts with one upsert per project and bucket
+
+        Per-bucket counts go to `project_events`, running totals used for
+        ordering to `project_popularity`. Counts for unknown projects are
+        discarded. Each document records the ids of its recent flushes and
+        skips one it has seen, so retrying a partly applied flush is safe.
+        """
+        try:
+            project_ids = list({project_id for project_id, _ in counts})
+            known = await self._guarded(
+                lambda: self.db.projects.find(
+                    {"_id": {"$in": project_ids}}, {"_id": 1}
+                ).to_list(length=None)
+            )
+            known = {project["_id"] for project in known}
+
+            bucket_updates = []
+            totals: Dict[uuid.UUID, Counter] = defaultdict(Counter)
+            for (project_id, bucket), events in counts.items():
+                if project_id not in known:
+                    continue
+                bucket_updates.append(UpdateOne(
+                    {
+                        "p": project_id,
+                        "b": datetime.fromtimestamp(bucket, timezone.utc),
+                        "f": {"$ne": flush_id},
+                    },
+                    {
+                        "$inc": {f"c.{event_type}": count for event_type, count in events.items()},
+                        "$push": {"f": {"$each": [flush_id], "$slice": -RECENT_FLUSHES}},
+                    },
+                    upsert=True,
+                ))
+                totals[project_id].update(events)
+            if not bucket_updates:
+                return
+            now = utc_now()
+            popularity_updates = [
+                UpdateOne(
+                    {"_id": project_id, "f": {"$ne": flush_id}},
+                    {
+                        "$inc": {
+                            "v": events["view"],
+                            "k": events["demo_click"] + events["github_click"],
+                        },
+                        "$set": {"ua": now},
+                        "$push": {"f": {"$each": [flush_id], "$slice": -RECENT_FLUSHES}},
+                    },
+                    upsert=True,
+                )
+                for project_id, events in totals.items()
+            ]
+            await self._apply_once(self.db.project_events, bucket_updates)
+            await self._apply_once(self.db.project_popularity, popularity_updates)
+        except Exception as e:
+            logger.error("Error recording project events: %s", e)
+            raise
+
+    async def _apply_once(self, collection, updates: List[UpdateOne]):
+        """Run flush upserts; a duplicate key means the flush was applied already
+
+        A document that already holds the flush id does not match the
+        filter, so the upsert tries to insert a second copy of its key.
+        """
+        try:
+            await self._guarded(lambda: collection.bulk_write(updates, ordered=False))
+        except BulkWriteError as e:
+            details = e.details
+            if details.get("writeConcernErrors") or any(
+                error["code"] != DUPLICATE_KEY for error in details.get("writeErrors", [])
+            ):
+                raise
+
+    async def get_project_popularity(self, project_ids: List[str]) -> Dict[str, Tuple[int, int]]:
+        """Clicks and views per project id; projects without events are absent"""
+        try:
+            popularity = await self._guarded(
+                lambda: self.read_db.project_popularity.find(
+                    {"_id": {"$in": [uuid.UUID(project_id) for project_id in project_ids]}}
+                ).to_list(length=None)
+            )
+            return {
+                str(entry["_id"]): (entry.get("k", 0), entry.get("v", 0))
+                for entry in popularity
+            }
+        except Exception as e:
+            logger.error("Error getting project popularity: %s", e)
+            raise
 
     # Contact Info operations
     async def get_contact_info(self) -> Optional[ContactInfo]:
         """Get contact information"""
         try:
-            contact_info = await self.db.contact_info.find_one()
+            contact_info = await self._guarded(
+                lambda: self.read_db.contact_info.find_one()
+            )
             if contact_info:
-                return ContactInfo(**contact_info)
+                return from_document(contact_info, ContactInfo, CONTACT_INFO_FIELDS)
             return None
         except Exception as e:
-            logger.error(f"Error getting contact info: {e}")
-            return None
+            logger.error("Error getting contact info: %s", e)
+            raise
 
     async def upsert_contact_info(self, contact_info: ContactInfo) -> str:
         """Create or update contact information"""
         try:
-            contact_info_dict = contact_info.dict()
-            result = await self.db.contact_info.replace_one(
-                {}, contact_info_dict, upsert=True
+            contact_info_doc = to_document(contact_info, CONTACT_INFO_FIELDS)
+            # Single document collection: keep the existing _id, which is immutable
+            existing = await self._guarded(
+                lambda: self.db.contact_info.find_one({}, {"_id": 1})
             )
-            return contact_info.id
+            if existing:
+                contact_info_doc["_id"] = existing["_id"]
+            result = await self._guarded(
+                lambda: self.db.contact_info.replace_one(
+                    {"_id": contact_info_doc["_id"]}, contact_info_doc, upsert=True
+                )
+            )
+            return str(contact_info_doc["_id"])
         except Exception as e:
-            logger.error(f"Error upserting contact info: {e}")
+            logger.error("Error upserting contact info: %s", e)
             raise
 
     async def seed_contact_info(self, contact_info: ContactInfo):
@@ -172,16 +481,34 @@ class Database:
             await self.upsert_contact_info(contact_info)
             logger.info("Seeded contact info")
         except Exception as e:
-            logger.error(f"Error seeding contact info: {e}")
+            logger.error("Error seeding contact info: %s", e)
             raise
 
 # Global database instance
 db = None
 
+def open_database(operation_timeout: Optional[float] = None) -> Database:
+    """New connection configured from the environment
+
+    `operation_timeout` overrides DB_OPERATION_TIMEOUT; the client-wide
+    driver deadline follows it.
+    """
+    if operation_timeout is None:
+        operation_timeout = float(os.environ.get(
+            'DB_OPERATION_TIMEOUT', DEFAULT_OPERATION_TIMEOUT
+        ))
+    max_staleness = int(os.environ.get(
+        'MONGO_MAX_STALENESS_SECONDS', DEFAULT_MAX_STALENESS_SECONDS
+    ))
+    return Database(
+        os.environ['MONGO_URL'], os.environ['DB_NAME'],
+        max_staleness_seconds=max_staleness,
+        operation_timeout=operation_timeout,
+    )
+
 def get_database() -> Database:
+    """The request-path connection shared by the server"""
     global db
     if db is None:
-        mongo_url = os.environ['MONGO_URL']
-        db_name = os.environ['DB_NAME']
-        db = Database(mongo_url, db_name)
-    return db
\ No newline at end of file
+        db = open_database()
+    return db
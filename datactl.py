@@ -0,0 +1,277 @@
+"""
+Dump and restore the portfolio database
+
+    python datactl.py dump backups/2024-06-01             # every collection
+    python datactl.py restore backups/2024-06-01 --drop   # replace existing data
+
+A dump is a directory holding `manifest.json` and, per collection, gzipped
+NDJSON chunks of at most `--chunk-size` documents (`<collection>/00000.ndjson.gz`).
+Documents are MongoDB Extended JSON (relaxed), so binary UUIDs and dates
+round-trip exactly. Collections are processed concurrently; each streams
+through two batches at a time, encoding and compression run in worker
+threads, and restores write with unordered `insert_many` batches.
+MONGO_URL and DB_NAME select the database, as for the server.
+"""
+
+from typing import Dict, IO, Iterable, List, Optional
+from pathlib import Path
+from datetime import datetime, timezone
+from bson import json_util
+from bson.binary import UuidRepresentation
+from bson.json_util import JSONMode, JSONOptions
+from dotenv import load_dotenv
+import asyncio
+import gzip
+import json
+import typer
+
+from database import COLLECTIONS, MAINTENANCE_OPERATION_TIMEOUT, Database, open_database
+from schema import SCHEMA_VERSION
+
+ROOT_DIR = Path(__file__).parent
+
+JSON_OPTIONS = JSONOptions(
+    json_mode=JSONMode.RELAXED,
+    uuid_representation=UuidRepresentation.STANDARD,
+    tz_aware=True,
+    tzinfo=timezone.utc,
+)
+MANIFEST = "manifest.json"
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 100000
+# Dumps and restores run far longer than a request-path call may
+DEFAULT_TIMEOUT = MAINTENANCE_OPERATION_TIMEOUT
+
+cli = typer.Typer(help="Dump and restore the portfolio database")
+
+
+class ChunkWriter:
+    """Writes documents to numbered gzipped NDJSON files (blocking; run in a thread)"""
+
+    def __init__(self, directory: Path, chunk_size: int):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.chunks: List[str] = []
+        self.documents = 0
+        self._file: Optional[IO[bytes]] = None
+        self._in_chunk = 0
+
+    def write(self, documents: List[dict]):
+        for document in documents:
+            if self._file is None or self._in_chunk >= self.chunk_size:
+                self._next_chunk()
+            self._file.write(json_util.dumps(document, json_options=JSON_OPTIONS).encode())
+            self._file.write(b"\n")
+            self._in_chunk += 1
+        self.documents += len(documents)
+
+    def _next_chunk(self):
+        self.close()
+        name = f"{len(self.chunks):05d}.ndjson.gz"
+        self._file = gzip.open(self.directory / name, "wb", compresslevel=6)
+        self.chunks.append(name)
+        self._in_chunk = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ChunkReader:
+    """Reads documents back from a collection's chunks (blocking; run in a thread)"""
+
+    def __init__(self, directory: Path, chunks: Iterable[str]):
+        self._paths = [directory / name for name in chunks]
+        self._file: Optional[IO[bytes]] = None
+
+    def read(self, count: int) -> List[dict]:
+        documents = []
+        while len(documents) < count:
+            if self._file is None:
+                if not self._paths:
+                    break
+                self._file = gzip.open(self._paths.pop(0), "rb")
+            line = self._file.readline()
+            if not line:
+                self.close()
+                continue
+            documents.append(json_util.loads(line, json_options=JSON_OPTIONS))
+        return documents
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+async def dump_collection(collection, directory: Path, batch_size: int, chunk_size: int) -> dict:
+    """Stream a collection into chunks; returns its manifest entry"""
+    directory.mkdir(parents=True, exist_ok=True)
+    writer = ChunkWriter(directory, chunk_size)
+    writing: Optional[asyncio.Future] = None
+    batch = []
+    try:
+        # _id order makes dumps of unchanged data byte-for-byte repeatable
+        async for document in collection.find({}).sort("_id", 1).batch_size(batch_size):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                # Encode and compress this batch while the next one is fetched
+                if writing is not None:
+                    await writing
+                writing = asyncio.ensure_future(asyncio.to_thread(writer.write, batch))
+                batch = []
+        if writing is not None:
+            await writing
+        if batch:
+            await asyncio.to_thread(writer.write, batch)
+    finally:
+        await asyncio.to_thread(writer.close)
+    return {"documents": writer.documents, "chunks": writer.chunks}
+
+
+async def dump_database(
+    db: Database,
+    directory: Path,
+    collections: Iterable[str] = COLLECTIONS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """Dump collections concurrently and write the manifest last"""
+    directory.mkdir(parents=True, exist_ok=True)
+    collections = list(collections)
+    entries = await asyncio.gather(*(
+        dump_collection(db.db[name], directory / name, batch_size, chunk_size)
+        for name in collections
+    ))
+    manifest = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "schema_version": SCHEMA_VERSION,
+        "collections": dict(zip(collections, entries)),
+    }
+    # A dump without a manifest is incomplete and cannot be restored
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def read_manifest(directory: Path) -> dict:
+    path = directory / MANIFEST
+    if not path.exists():
+        raise ValueError(f"{directory} is not a complete dump (no {MANIFEST})")
+    return json.loads(path.read_text())
+
+
+async def restore_collection(collection, directory: Path, entry: dict, batch_size: int) -> int:
+    """Insert a collection's documents in batches; returns how many were read"""
+    reader = ChunkReader(directory, entry["chunks"])
+    restored = 0
+    try:
+        # Decompress and decode the next batch while this one is inserted
+        reading = asyncio.ensure_future(asyncio.to_thread(reader.read, batch_size))
+        while True:
+            batch = await reading
+            if not batch:
+                break
+            reading = asyncio.ensure_future(asyncio.to_thread(reader.read, batch_size))
+            await collection.insert_many(batch, ordered=False)
+            restored += len(batch)
+    finally:
+        await asyncio.to_thread(reader.close)
+    return restored
+
+
+async def restore_database(
+    db: Database,
+    directory: Path,
+    drop: bool = False,
+    collections: Optional[Iterable[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, int]:
+    """Restore a dump concurrently, then rebuild the indexes
+
+    Without `drop`, every target collection must be empty.
+    """
+    manifest = read_manifest(directory)
+    if manifest["schema_version"] > SCHEMA_VERSION:
+        raise ValueError(
+            f"Dump has schema version {manifest['schema_version']}, "
+            f"this code reads up to {SCHEMA_VERSION}"
+        )
+    names = list(collections) if collections is not None else list(manifest["collections"])
+    missing = [name for name in names if name not in manifest["collections"]]
+    if missing:
+        raise ValueError(f"Not in the dump: {', '.join(missing)}")
+
+    if drop:
+        await asyncio.gather(*(db.db[name].drop() for name in names))
+    else:
+        counts = await asyncio.gather(*(db.db[name].count_documents({}) for name in names))
+        occupied = [name for name, count in zip(names, counts) if count]
+        if occupied:
+            raise ValueError(f"Collections are not empty: {', '.join(occupied)} (use --drop)")
+
+    restored = await asyncio.gather(*(
+        restore_collection(db.db[name], directory / name, manifest["collections"][name], batch_size)
+        for name in names
+    ))
+    await db.ensure_indexes()
+    return dict(zip(names, restored))
+
+
+def connect(timeout: float) -> Database:
+    load_dotenv(ROOT_DIR / '.env')
+    return open_database(timeout)
+
+
+def _names(collections: Optional[str]) -> Optional[List[str]]:
+    return [name.strip() for name in collections.split(",")] if collections else None
+
+
+@cli.command()
+def dump(
+    directory: Path = typer.Argument(..., help="Output directory"),
+    collections: Optional[str] = typer.Option(None, help="Comma-separated subset; default all"),
+    batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, min=1),
+    chunk_size: int = typer.Option(DEFAULT_CHUNK_SIZE, min=1, help="Documents per chunk file"),
+    timeout: float = typer.Option(DEFAULT_TIMEOUT, help="Deadline for each database call, in seconds"),
+):
+    """Dump collections to gzipped NDJSON chunks"""
+    async def run():
+        db = connect(timeout)
+        try:
+            return await dump_database(db, directory, _names(collections) or COLLECTIONS, batch_size, chunk_size)
+        finally:
+            await db.close()
+
+    manifest = asyncio.run(run())
+    for name, entry in manifest["collections"].items():
+        typer.echo(f"{name}: {entry['documents']} documents in {len(entry['chunks'])} chunks")
+
+
+@cli.command()
+def restore(
+    directory: Path = typer.Argument(..., help="Dump directory"),
+    drop: bool = typer.Option(False, help="Drop the collections before restoring"),
+    collections: Optional[str] = typer.Option(None, help="Comma-separated subset; default all in the dump"),
+    batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, min=1),
+    timeout: float = typer.Option(DEFAULT_TIMEOUT, help="Deadline for each database call, in seconds"),
+):
+    """Restore a dump made by `dump`"""
+    async def run():
+        db = connect(timeout)
+        try:
+            return await restore_database(db, directory, drop, _names(collections), batch_size)
+        finally:
+            await db.close()
+
+    try:
+        restored = asyncio.run(run())
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    for name, count in restored.items():
+        typer.echo(f"{name}: {count} documents restored")
+
+
+if __name__ == "__main__":
+    cli()
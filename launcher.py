@@ -0,0 +1,123 @@
+"""
+Production launcher for the portfolio backend
+
+    python launcher.py --profile uvicorn     # multi-process uvicorn, uvloop + httptools
+    python launcher.py --profile gunicorn    # gunicorn master with preloaded app
+    python launcher.py --profile dev         # single process, library defaults
+
+Worker count defaults to WEB_CONCURRENCY or the number of CPU cores.
+Neither uvicorn nor its gunicorn worker speaks HTTP/2; terminate HTTP/2 and
+TLS at the proxy and let it reuse keep-alive connections to these workers.
+"""
+
+from typing import Optional
+import importlib.util
+import os
+import typer
+
+APP = "server:app"
+
+# Longer than the idle timeout of common load balancers (60s), so the proxy
+# closes idle upstream connections rather than racing the server to it.
+KEEP_ALIVE_SECONDS = 75
+# Listen queue for connection bursts; the kernel caps it at net.core.somaxconn
+BACKLOG = 2048
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def default_workers() -> int:
+    return int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+
+def event_loop() -> str:
+    return "uvloop" if _available("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if _available("httptools") else "h11"
+
+
+def run_dev(host: str, port: int):
+    import uvicorn
+    uvicorn.run(APP, host=host, port=port)
+
+
+def run_uvicorn(host: str, port: int, workers: int):
+    import uvicorn
+    uvicorn.run(
+        APP,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=event_loop(),
+        http=http_protocol(),
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+        backlog=BACKLOG,
+        proxy_headers=True,
+        access_log=False,
+    )
+
+
+def run_gunicorn(host: str, port: int, workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    class PortfolioApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "worker_class": "launcher.TunedUvicornWorker",
+                # Import the app once in the master; workers share the
+                # imported modules copy-on-write after fork. Database
+                # clients are created lazily inside each worker.
+                "preload_app": True,
+                "keepalive": KEEP_ALIVE_SECONDS,
+                "backlog": BACKLOG,
+                "graceful_timeout": 30,
+                # Recycle workers now and then, staggered so they don't all restart together
+                "max_requests": 10000,
+                "max_requests_jitter": 1000,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from server import app
+            return app
+
+    PortfolioApplication().run()
+
+
+try:
+    from uvicorn.workers import UvicornWorker
+
+    class TunedUvicornWorker(UvicornWorker):
+        CONFIG_KWARGS = {"loop": event_loop(), "http": http_protocol(), "access_log": False}
+except ImportError:
+    # uvicorn.workers needs gunicorn, which only the gunicorn profile uses
+    pass
+
+
+def main(
+    profile: str = typer.Option("uvicorn", help="dev, uvicorn or gunicorn"),
+    host: str = typer.Option("0.0.0.0"),
+    port: int = typer.Option(8001),
+    workers: Optional[int] = typer.Option(None, help="Defaults to WEB_CONCURRENCY or the CPU count"),
+):
+    """Start the portfolio backend with a tuned server profile"""
+    workers = workers or default_workers()
+    if profile == "dev":
+        run_dev(host, port)
+    elif profile == "uvicorn":
+        run_uvicorn(host, port, workers)
+    elif profile == "gunicorn":
+        run_gunicorn(host, port, workers)
+    else:
+        raise typer.BadParameter(f"Unknown profile: {profile}", param_hint="--profile")
+
+
+if __name__ == "__main__":
+    typer.run(main)
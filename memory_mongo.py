@@ -0,0 +1,328 @@
+"""
+In-memory stand-in for the parts of the Motor API that `Database` uses
+
+Documents are deep-copied on the way in and out, as they would be by a
+BSON round-trip. Used by the offline test suite and benchmarks; it is not
+a general purpose MongoDB emulator.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from copy import deepcopy
+from types import SimpleNamespace
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import uuid
+
+_MISSING = object()
+
+
+def _get(document: dict, key: str) -> Any:
+    value = document
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+        for operator, operand in condition.items():
+            if operator == "$exists":
+                if (value is not _MISSING) != bool(operand):
+                    return False
+            elif operator == "$in":
+                if value not in operand:
+                    return False
+            elif operator == "$ne":
+                if value == operand or (isinstance(value, list) and operand in value):
+                    return False
+            elif operator in ("$gt", "$gte", "$lt", "$lte"):
+                if value is _MISSING:
+                    return False
+                if operator == "$gt" and not value > operand:
+                    return False
+                if operator == "$gte" and not value >= operand:
+                    return False
+                if operator == "$lt" and not value < operand:
+                    return False
+                if operator == "$lte" and not value <= operand:
+                    return False
+            else:
+                raise NotImplementedError(f"Query operator {operator}")
+        return True
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return value == condition
+
+
+def matches(document: dict, query: Optional[dict]) -> bool:
+    return all(_matches_condition(_get(document, key), condition) for key, condition in (query or {}).items())
+
+
+def _project(document: dict, projection: Optional[dict]) -> dict:
+    document = deepcopy(document)
+    if not projection:
+        return document
+    inclusive = [value for key, value in projection.items() if key != "_id"] or [projection["_id"]]
+    if any(inclusive):
+        projected = {key: document[key] for key, value in projection.items() if value and key in document}
+        if projection.get("_id", 1) and "_id" in document:
+            projected["_id"] = document["_id"]
+        return projected
+    for key in projection:
+        document.pop(key, None)
+    return document
+
+
+def _sort_key(value: Any) -> Tuple:
+    # Missing and None sort first, as in MongoDB
+    if value is _MISSING or value is None:
+        return (0, 0)
+    return (1, value)
+
+
+def _apply_update(document: dict, update: dict, inserting: bool):
+    for operator, fields in update.items():
+        if operator == "$set":
+            document.update(deepcopy(fields))
+        elif operator == "$setOnInsert":
+            if inserting:
+                document.update(deepcopy(fields))
+        elif operator == "$inc":
+            for key, amount in fields.items():
+                target = document
+                parts = key.split(".")
+                for part in parts[:-1]:
+                    target = target.setdefault(part, {})
+                target[parts[-1]] = target.get(parts[-1], 0) + amount
+        elif operator == "$push":
+            for key, spec in fields.items():
+                items = document.setdefault(key, [])
+                if isinstance(spec, dict) and "$each" in spec:
+                    items.extend(deepcopy(spec["$each"]))
+                    if "$sort" in spec:
+                        for sort_key, direction in reversed(list(spec["$sort"].items())):
+                            items.sort(key=lambda item: _sort_key(_get(item, sort_key)), reverse=direction < 0)
+                    if "$slice" in spec:
+                        # Negative keeps the last items, as in MongoDB
+                        limit = spec["$slice"]
+                        items[:] = items[limit:] if limit < 0 else items[:limit]
+                else:
+                    items.append(deepcopy(spec))
+        else:
+            raise NotImplementedError(f"Update operator {operator}")
+
+
+def _seed_from_query(query: Optional[dict]) -> dict:
+    """Equality parts of an upsert query become fields of the new document"""
+    return {
+        key: deepcopy(value) for key, value in (query or {}).items()
+        if not key.startswith("$") and not (isinstance(value, dict) and any(k.startswith("$") for k in value))
+    }
+
+
+class MemoryCursor:
+    def __init__(self, documents: List[dict], projection: Optional[dict]):
+        self._documents = documents
+        self._projection = projection
+
+    def sort(self, key, direction: int = 1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for sort_key, sort_direction in reversed(keys):
+            self._documents.sort(key=lambda d: _sort_key(_get(d, sort_key)), reverse=sort_direction < 0)
+        return self
+
+    def limit(self, count: int):
+        if count:
+            self._documents = self._documents[:count]
+        return self
+
+    def batch_size(self, size: int):
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        documents = self._documents if length is None else self._documents[:length]
+        return [_project(document, self._projection) for document in documents]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in list(self._documents):
+            yield _project(document, self._projection)
+
+
+class MemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self._documents: Dict[Any, dict] = {}
+        # (key names, partial filter) per unique index
+        self._unique_indexes: List[Tuple[List[str], Optional[dict]]] = []
+
+    def _check_unique(self, document: dict, ignore_id: Any = _MISSING):
+        for keys, partial in self._unique_indexes:
+            if not matches(document, partial):
+                continue
+            values = [_get(document, key) for key in keys]
+            for _id, other in self._documents.items():
+                if (_id != ignore_id and matches(other, partial)
+                        and [_get(other, key) for key in keys] == values):
+                    raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name}")
+
+    def _store(self, document: dict, ignore_id: Any = _MISSING) -> Any:
+        document = deepcopy(document)
+        document.setdefault("_id", uuid.uuid4())
+        if document["_id"] in self._documents and document["_id"] != ignore_id:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} _id")
+        self._check_unique(document, ignore_id)
+        self._documents[document["_id"]] = document
+        return document["_id"]
+
+    def _first(self, query: Optional[dict]) -> Optional[dict]:
+        return next((d for d in self._documents.values() if matches(d, query)), None)
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None, session=None, **kwargs) -> MemoryCursor:
+        return MemoryCursor([d for d in self._documents.values() if matches(d, filter)], projection)
+
+    async def find_one(self, filter: Optional[dict] = None, projection: Optional[dict] = None, session=None, **kwargs):
+        document = self._first(filter)
+        return None if document is None else _project(document, projection)
+
+    async def count_documents(self, filter: dict, session=None, **kwargs) -> int:
+        return sum(1 for d in self._documents.values() if matches(d, filter))
+
+    async def insert_one(self, document: dict, session=None, **kwargs):
+        return SimpleNamespace(inserted_id=self._store(document), acknowledged=True)
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True, session=None, **kwargs):
+        inserted = []
+        for document in documents:
+            try:
+                inserted.append(self._store(document))
+            except DuplicateKeyError:
+                if ordered:
+                    raise
+        return SimpleNamespace(inserted_ids=inserted, acknowledged=True)
+
+    def _replace(self, query: dict, replacement: dict, upsert: bool) -> int:
+        existing = self._first(query)
+        if existing is None:
+            if upsert:
+                self._store({**_seed_from_query(query), **replacement})
+            return 0
+        document = {**replacement, "_id": existing["_id"]}
+        self._store(document, ignore_id=existing["_id"])
+        return 1
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False, session=None, **kwargs):
+        return SimpleNamespace(modified_count=self._replace(filter, replacement, upsert), acknowledged=True)
+
+    def _update(self, query: dict, update: dict, upsert: bool) -> Tuple[Optional[dict], Optional[dict]]:
+        """Apply an update; returns the document before and after"""
+        existing = self._first(query)
+        if existing is None:
+            if not upsert:
+                return None, None
+            document = _seed_from_query(query)
+            _apply_update(document, update, inserting=True)
+            _id = self._store(document)
+            return None, self._documents[_id]
+        before = deepcopy(existing)
+        document = deepcopy(existing)
+        _apply_update(document, update, inserting=False)
+        self._store(document, ignore_id=existing["_id"])
+        return before, self._documents[existing["_id"]]
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False, session=None, **kwargs):
+        before, after = self._update(filter, update, upsert)
+        return SimpleNamespace(matched_count=int(before is not None), acknowledged=True)
+
+    async def find_one_and_update(self, filter: dict, update: dict, projection: Optional[dict] = None,
+                                  upsert: bool = False, return_document: bool = False, session=None, **kwargs):
+        before, after = self._update(filter, update, upsert)
+        document = after if return_document else before
+        return None if document is None else _project(document, projection)
+
+    async def delete_one(self, filter: dict, session=None, **kwargs):
+        document = self._first(filter)
+        if document is not None:
+            del self._documents[document["_id"]]
+        return SimpleNamespace(deleted_count=int(document is not None), acknowledged=True)
+
+    async def delete_many(self, filter: dict, session=None, **kwargs):
+        doomed = [_id for _id, d in self._documents.items() if matches(d, filter)]
+        for _id in doomed:
+            del self._documents[_id]
+        return SimpleNamespace(deleted_count=len(doomed), acknowledged=True)
+
+    async def bulk_write(self, requests: list, ordered: bool = True, session=None, **kwargs):
+        errors = []
+        for index, request in enumerate(requests):
+            try:
+                if isinstance(request, ReplaceOne):
+                    self._replace(request._filter, request._doc, request._upsert)
+                elif isinstance(request, UpdateOne):
+                    self._update(request._filter, request._doc, request._upsert)
+                elif isinstance(request, DeleteOne):
+                    await self.delete_one(request._filter)
+                else:
+                    raise NotImplementedError(type(request).__name__)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "writeConcernErrors": []})
+        return SimpleNamespace(acknowledged=True)
+
+    async def create_index(self, keys, unique: bool = False, partialFilterExpression: Optional[dict] = None,
+                           **kwargs) -> str:
+        keys = [keys] if isinstance(keys, str) else keys
+        names = [key if isinstance(key, str) else key[0] for key in keys]
+        if unique and (names, partialFilterExpression) not in self._unique_indexes:
+            self._unique_indexes.append((names, partialFilterExpression))
+        return "_".join(names)
+
+    async def drop_indexes(self, session=None, **kwargs):
+        self._unique_indexes = []
+
+    async def drop(self, session=None, **kwargs):
+        self._documents.clear()
+        self._unique_indexes = []
+
+
+class MemoryDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def list_collection_names(self, session=None, **kwargs) -> List[str]:
+        return list(self._collections)
+
+
+class MemoryMongoClient:
+    def __init__(self):
+        self._databases: Dict[str, MemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        # Read preferences are irrelevant: every "member" is the same store
+        return self[name]
+
+    def close(self):
+        pass
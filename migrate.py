@@ -0,0 +1,73 @@
+from pymongo import ReplaceOne, DeleteOne
+from database import MAINTENANCE_OPERATION_TIMEOUT, open_database
+from models import Project, Skill, Contact, ContactInfo
+from schema import (
+    PROJECT_FIELDS, SKILL_FIELDS, CONTACT_FIELDS, CONTACT_INFO_FIELDS,
+    VERSION_FIELD, to_document
+)
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# collection name -> (model, stored field mapping)
+COLLECTIONS = {
+    "projects": (Project, PROJECT_FIELDS),
+    "skills": (Skill, SKILL_FIELDS),
+    "contacts": (Contact, CONTACT_FIELDS),
+    "contact_info": (ContactInfo, CONTACT_INFO_FIELDS),
+}
+
+BATCH_SIZE = 500
+
+
+async def migrate_collection(collection, model, fields) -> int:
+    """Rewrite legacy documents (ObjectId `_id` plus string `id`) in compact form"""
+    migrated = 0
+    operations = []
+    # Legacy documents are the only ones carrying a public `id` field,
+    # so re-running the migration is a no-op.
+    async for legacy in collection.find({"id": {"$exists": True}}):
+        legacy_id = legacy.pop("_id")
+        document = to_document(model(**legacy), fields)
+        if model is Contact and "h" not in document:
+            # Still a version 1 contact: reads compute the hash (records.py).
+            # Storing one here without a time bucket could make legacy
+            # duplicates collide on the unique (h, b) index.
+            document[VERSION_FIELD] = 1
+        operations.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+        operations.append(DeleteOne({"_id": legacy_id}))
+        if len(operations) >= BATCH_SIZE:
+            await collection.bulk_write(operations, ordered=True)
+            migrated += len(operations) // 2
+            operations = []
+    if operations:
+        await collection.bulk_write(operations, ordered=True)
+        migrated += len(operations) // 2
+    return migrated
+
+
+async def migrate_database():
+    """One-shot migration of every collection to the compact schema"""
+    # Rewrites and index builds run far longer than a request-path call may
+    db = open_database(MAINTENANCE_OPERATION_TIMEOUT)
+    try:
+        for name, (model, fields) in COLLECTIONS.items():
+            migrated = await migrate_collection(db.db[name], model, fields)
+            logger.info("Migrated %s %s documents", migrated, name)
+        # Drop indexes on the old field names, then build the new ones
+        for name in COLLECTIONS:
+            await db.db[name].drop_indexes()
+        await db.ensure_indexes()
+        await db.recompute_skills_summary()
+        logger.info("Migration completed successfully!")
+    except Exception as e:
+        logger.error("Error migrating database: %s", e)
+        raise
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate_database())
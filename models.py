@@ -1,9 +1,13 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
 from enum import Enum
+import hashlib
 import uuid
 
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
 # Enums
 class SkillCategory(str, Enum):
     frontend = "frontend"
@@ -27,10 +31,12 @@ class ProjectCreate(ProjectBase):
 
 class Project(ProjectBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
 
     class Config:
+        # Read records are validated from their attributes at the API boundary
+        from_attributes = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
@@ -45,11 +51,19 @@ class SkillBase(BaseModel):
 class SkillCreate(SkillBase):
     pass
 
+class SkillUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    level: Optional[int] = Field(None, ge=0, le=100)
+    years: Optional[int] = Field(None, ge=0, le=50)
+    category: Optional[SkillCategory] = None
+
 class Skill(SkillBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
 
     class Config:
+        # Read records are validated from their attributes at the API boundary
+        from_attributes = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
@@ -61,12 +75,33 @@ class ContactSubmission(BaseModel):
     subject: str = Field(..., min_length=1, max_length=200)
     message: str = Field(..., min_length=1, max_length=2000)
 
+def contact_content_hash(name: str, email: str, subject: str, message: str) -> str:
+    """Digest of a submission's normalized content, used to detect repeats"""
+    normalized = "\x1f".join(
+        " ".join(value.split()).casefold() for value in (name, email, subject, message)
+    )
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
 class Contact(ContactSubmission):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    content_hash: Optional[str] = None
+    is_read: bool = False
+    created_at: datetime = Field(default_factory=utc_now)
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+
+class ContactResponse(ContactSubmission):
+    """A stored submission as admins see it; the dedup hash stays internal"""
+    id: str
     is_read: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime
 
     class Config:
+        # Read records are validated from their attributes at the API boundary
+        from_attributes = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
@@ -81,13 +116,36 @@ class ContactInfoBase(BaseModel):
 
 class ContactInfo(ContactInfoBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=utc_now)
 
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
 
+# Analytics Models
+class ProjectEventType(str, Enum):
+    view = "view"
+    demo_click = "demo_click"
+    github_click = "github_click"
+
+class ProjectEvent(BaseModel):
+    project_id: uuid.UUID
+    type: ProjectEventType
+
+class ProjectEventBatch(BaseModel):
+    events: List[ProjectEvent] = Field(..., min_items=1, max_items=100)
+
+# Auth Models
+class AdminLogin(BaseModel):
+    username: str = Field(..., min_length=1, max_length=100)
+    password: str = Field(..., min_length=1, max_length=200)
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
 # Response Models
 class ApiResponse(BaseModel):
     success: bool
@@ -98,4 +156,29 @@ class SkillsResponse(BaseModel):
     frontend: List[Skill]
     backend: List[Skill]
     design: List[Skill]
-    tools: List[Skill]
\ No newline at end of file
+    tools: List[Skill]
+
+class CategorySummary(BaseModel):
+    count: int
+    average_level: float
+    average_years: float
+    experience_weighted_level: float
+
+class RankedSkill(BaseModel):
+    id: str
+    name: str
+    category: SkillCategory
+    level: int
+    years: int
+    score: float
+
+class SkillsSummary(BaseModel):
+    categories: Dict[str, CategorySummary]
+    top_skills: List[RankedSkill]
+    experience_ranking: List[RankedSkill]
+    updated_at: datetime
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
@@ -0,0 +1,146 @@
+from typing import Dict, Optional
+from collections import Counter, deque
+from types import FrameType
+import sys
+import threading
+import time
+
+from structured_logging import request_context
+
+MAX_PROFILE_SECONDS = 60
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    """Root-to-leaf stack in the `a;b;c` form flamegraph tools consume"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def format_collapsed(samples: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+class SamplingProfiler:
+    """Samples one thread's stack on a timer from a separate thread
+
+    Sampling only reads `sys._current_frames()`; nothing is installed in
+    the profiled thread, so it runs at full speed between samples. One
+    session at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, thread_id: int, seconds: float, interval: float) -> Optional[Counter]:
+        """Sample `thread_id` for `seconds`; None if a session is already running"""
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            samples = Counter()
+            deadline = time.monotonic() + min(seconds, MAX_PROFILE_SECONDS)
+            while time.monotonic() < deadline:
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    samples[collapse_stack(frame)] += 1
+                del frame
+                time.sleep(interval)
+            return samples
+        finally:
+            self._lock.release()
+
+
+class SlowRequestTracer:
+    """Keeps traces of requests slower than `threshold_ms`
+
+    A watchdog thread samples the event loop's stack while a request is
+    past the threshold, so a trace shows what the loop was doing during
+    the slow part, not just how long it took.
+    """
+
+    def __init__(self, threshold_ms: float, max_traces: int = 100):
+        self.threshold = threshold_ms / 1000
+        self.traces: deque = deque(maxlen=max_traces)
+        self._in_flight: Dict[int, dict] = {}
+        self._watchdog: Optional[threading.Thread] = None
+
+    def begin(self, key: int):
+        self._in_flight[key] = {
+            "started": time.monotonic(),
+            "thread_id": threading.get_ident(),
+            "samples": Counter(),
+        }
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, name="slow-request-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def end(self, key: int, trace: dict):
+        entry = self._in_flight.pop(key, None)
+        if entry is None:
+            return
+        duration = time.monotonic() - entry["started"]
+        if duration >= self.threshold:
+            trace["duration_ms"] = round(duration * 1000, 3)
+            trace["stacks"] = format_collapsed(entry["samples"])
+            self.traces.append(trace)
+
+    def _watch(self):
+        while True:
+            # Read each time round so a changed threshold takes effect
+            time.sleep(max(self.threshold / 4, 0.005))
+            now = time.monotonic()
+            frames = None
+            for entry in list(self._in_flight.values()):
+                if now - entry["started"] < self.threshold:
+                    continue
+                if frames is None:
+                    frames = sys._current_frames()
+                frame = frames.get(entry["thread_id"])
+                if frame is not None:
+                    entry["samples"][collapse_stack(frame)] += 1
+            del frames
+
+
+class SlowRequestMiddleware:
+    """Feeds every HTTP request through a SlowRequestTracer"""
+
+    def __init__(self, app, tracer: SlowRequestTracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        context = request_context.get()
+        if scope["type"] != "http" or context is None:
+            return await self.app(scope, receive, send)
+
+        request_id = context["request_id"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        # Keyed by scope: client-supplied request ids need not be unique
+        key = id(scope)
+        self.tracer.begin(key)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self.tracer.end(key, {
+                "request_id": request_id,
+                "route": getattr(route, "path", scope["path"]),
+                "method": scope["method"],
+                "status": status,
+                "db_ms": round(context["db_ms"], 3),
+                "at": time.time(),
+            })
@@ -0,0 +1,99 @@
+"""
+Read-side records for bulk and internal paths
+
+Records are plain `__slots__` objects built straight from stored documents:
+no validation, no default factories. Validation happens once, at the API
+boundary, where FastAPI checks them against the endpoint's response model
+(the models read attributes, see `from_attributes`).
+
+Documents carry a schema version in `v`; older ones are upgraded in memory
+as they are read, nothing is rewritten in place.
+"""
+
+from typing import Any, Callable, Dict, Type
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from models import Project, Skill, ContactResponse, contact_content_hash
+from schema import (
+    PROJECT_FIELDS, SKILL_FIELDS, CONTACT_FIELDS, SCHEMA_VERSION, VERSION_FIELD, to_document
+)
+
+Upgrade = Callable[[dict], None]
+
+
+def _upgrade_contact_v1(document: dict):
+    # Submissions stored before deduplication have no content hash
+    if "h" not in document:
+        document["h"] = contact_content_hash(
+            document["n"], document["e"], document["s"], document["m"]
+        )
+
+
+class Record:
+    """Base for records; subclasses list their fields in `__slots__`"""
+
+    __slots__ = ()
+    # response model the record is validated against when it leaves the API
+    MODEL: Type[BaseModel]
+    # public name -> stored name, as in schema.py
+    FIELDS: Dict[str, str] = {}
+    # values for fields absent from the stored document
+    DEFAULTS: Dict[str, object] = {}
+    # version -> in-place upgrade of a document to the next version
+    UPGRADES: Dict[int, Upgrade] = {}
+
+    @classmethod
+    def from_document(cls, document: dict):
+        version = document.get(VERSION_FIELD, 1)
+        while version < SCHEMA_VERSION:
+            upgrade = cls.UPGRADES.get(version)
+            if upgrade is not None:
+                upgrade(document)
+            version += 1
+        record = cls.__new__(cls)
+        defaults = cls.DEFAULTS
+        for name, key in cls.FIELDS.items():
+            setattr(record, name, document.get(key, defaults.get(name)))
+        record.id = str(record.id)
+        return record
+
+    def dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_document(self) -> dict:
+        return to_document(self, self.FIELDS)
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and self.dict() == other.dict()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id!r})"
+
+
+class ProjectRecord(Record):
+    __slots__ = tuple(PROJECT_FIELDS)
+    MODEL = Project
+    FIELDS = PROJECT_FIELDS
+    DEFAULTS = {"featured": False}
+
+
+class SkillRecord(Record):
+    __slots__ = tuple(SKILL_FIELDS)
+    MODEL = Skill
+    FIELDS = SKILL_FIELDS
+
+
+class ContactRecord(Record):
+    __slots__ = tuple(CONTACT_FIELDS)
+    MODEL = ContactResponse
+    FIELDS = CONTACT_FIELDS
+    DEFAULTS = {"is_read": False}
+    UPGRADES = {1: _upgrade_contact_v1}
+
+
+def jsonable(data: Any) -> Any:
+    """`jsonable_encoder` that validates records against their model on the way out"""
+    return jsonable_encoder(data, custom_encoder={
+        Record: lambda record: jsonable_encoder(record.MODEL.model_validate(record))
+    })
@@ -0,0 +1,129 @@
+from typing import Dict, List, Optional, Tuple, Union
+from html import escape
+from pathlib import Path
+import re
+
+ROOT_DIR = Path(__file__).parent
+
+SKILL_CATEGORIES = ("frontend", "backend", "design", "tools")
+
+# Layout for the server-rendered markup, on top of the app stylesheets
+SSR_CSS = """
+main{max-width:72rem;margin:0 auto;padding:2rem 1rem}
+h1{font-size:2.25rem;margin:0 0 .5rem}
+h2{font-size:1.5rem;margin:2.5rem 0 1rem}
+.projects{display:grid;gap:1.5rem;grid-template-columns:repeat(auto-fill,minmax(18rem,1fr))}
+.project{border:1px solid hsl(var(--border));border-radius:var(--radius);overflow:hidden}
+.project img{width:100%;aspect-ratio:3/2;object-fit:cover;display:block}
+.project div{padding:1rem}
+.tech{display:flex;flex-wrap:wrap;gap:.25rem;padding:0;list-style:none}
+.tech li{font-size:.75rem;padding:.125rem .5rem;border-radius:9999px;background:hsl(var(--secondary))}
+.skills{display:grid;gap:1.5rem;grid-template-columns:repeat(auto-fill,minmax(14rem,1fr))}
+.skill{margin:.5rem 0}
+.bar{height:.5rem;border-radius:9999px;background:hsl(var(--muted))}
+.bar span{display:block;height:100%;border-radius:inherit;background:hsl(var(--primary))}
+"""
+
+
+def minify_css(css: str) -> str:
+    """Strip what a browser can't use without the Tailwind build, then minify"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"@tailwind[^;]*;", "", css)
+    css = re.sub(r"@apply[^;]*;", "", css)
+    # Drop blocks left empty, innermost first
+    previous = None
+    while previous != css:
+        previous = css
+        css = re.sub(r"[^{}]+\{\s*\}", "", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def load_critical_css() -> str:
+    sources = [ROOT_DIR / "index.css", ROOT_DIR / "App.css"]
+    css = "".join(path.read_text() for path in sources if path.exists())
+    # Equivalents of the @apply rules in index.css
+    css += "*{border-color:hsl(var(--border))}"
+    css += "body{background-color:hsl(var(--background));color:hsl(var(--foreground))}"
+    return minify_css(css + SSR_CSS)
+
+
+CRITICAL_CSS = load_critical_css()
+
+
+def render_projects(projects: List[dict]) -> str:
+    cards = []
+    for project in projects:
+        links = []
+        if project.get("demo_url"):
+            links.append(f'<a href="{escape(project["demo_url"])}" rel="noopener">Live demo</a>')
+        if project.get("github_url"):
+            links.append(f'<a href="{escape(project["github_url"])}" rel="noopener">Source</a>')
+        technologies = "".join(f"<li>{escape(tech)}</li>" for tech in project["technologies"])
+        cards.append(
+            f'<article class="project" id="project-{escape(project["id"])}">'
+            f'<img src="{escape(project["image"])}" alt="{escape(project["title"])}" '
+            f'width="600" height="400" loading="lazy" decoding="async">'
+            f'<div><h3>{escape(project["title"])}</h3>'
+            f'<p>{escape(project["category"])}</p>'
+            f'<p>{escape(project["description"])}</p>'
+            f'<ul class="tech">{technologies}</ul>'
+            f'{" ".join(links)}</div></article>'
+        )
+    return f'<section id="projects"><h2>Projects</h2><div class="projects">{"".join(cards)}</div></section>'
+
+
+def render_skills(skills: Dict[str, List[dict]]) -> str:
+    groups = []
+    for category in SKILL_CATEGORIES:
+        rows = "".join(
+            f'<div class="skill"><span>{escape(skill["name"])}</span> '
+            f'<small>{skill["years"]}y</small>'
+            f'<div class="bar" role="progressbar" aria-valuenow="{skill["level"]}" '
+            f'aria-valuemin="0" aria-valuemax="100"><span style="width:{skill["level"]}%"></span></div></div>'
+            for skill in skills.get(category, [])
+        )
+        groups.append(f"<div><h3>{category.title()}</h3>{rows}</div>")
+    return f'<section id="skills"><h2>Skills</h2><div class="skills">{"".join(groups)}</div></section>'
+
+
+def render_contact_info(contact_info: Optional[dict]) -> str:
+    if not contact_info:
+        return ""
+    email = escape(contact_info["email"])
+    lines = [f'<p><a href="mailto:{email}">{email}</a></p>']
+    for field in ("phone", "location", "availability", "response_time"):
+        if contact_info.get(field):
+            lines.append(f"<p>{escape(contact_info[field])}</p>")
+    return f'<section id="contact"><h2>Contact</h2>{"".join(lines)}</section>'
+
+
+def render_page(fragments: List[str]) -> str:
+    return (
+        '<!doctype html><html lang="en"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        '<meta name="description" content="Portfolio of Alex Chen: projects, skills and contact">'
+        f"<title>Alex Chen | Portfolio</title><style>{CRITICAL_CSS}</style></head>"
+        f'<body><div id="root"><main><h1>Alex Chen</h1>{"".join(fragments)}</main></div></body></html>'
+    )
+
+
+class FragmentCache:
+    """Rendered output per fragment name, valid for one content version
+
+    Only the latest version of each fragment is kept, so the cache never
+    grows past one entry per fragment.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[bytes, Union[str, bytes]]] = {}
+
+    def get(self, name: str, version: bytes) -> Optional[Union[str, bytes]]:
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        return None
+
+    def put(self, name: str, version: bytes, rendered: Union[str, bytes]):
+        self._entries[name] = (version, rendered)
@@ -0,0 +1,171 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from pathlib import Path
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# Errors that say the database is unhealthy. ConnectionFailure covers
+# AutoReconnect, NetworkTimeout and ServerSelectionTimeoutError. Anything
+# else (a duplicate key, a bad argument) is the caller's problem.
+DATABASE_FAILURES = (asyncio.TimeoutError, ConnectionFailure, ExecutionTimeout)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a per-call deadline
+
+    closed    -> calls go through; `failure_threshold` consecutive failures
+                 (timeouts and connection errors only) open it
+    open      -> calls fail fast with CircuitOpenError for `reset_timeout` seconds
+    half-open -> a single probe call is let through; success closes the breaker,
+                 failure opens it again
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    async def call(self, operation: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """Run `operation()` under the breaker, cancelling it after `timeout` seconds"""
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._probing):
+            raise CircuitOpenError("Database circuit breaker is open")
+
+        probe = state == self.HALF_OPEN
+        if probe:
+            self._probing = True
+        try:
+            result = await asyncio.wait_for(operation(), timeout)
+        except DATABASE_FAILURES:
+            self._record_failure(probe)
+            raise
+        finally:
+            if probe:
+                self._probing = False
+        self._record_success()
+        return result
+
+    def _record_success(self):
+        if self._state != self.CLOSED:
+            logger.info("Database circuit breaker closed")
+        self.failures = 0
+        self._state = self.CLOSED
+
+    def _record_failure(self, probe: bool):
+        self.failures += 1
+        if probe or self.failures >= self.failure_threshold:
+            if self._state != self.OPEN or probe:
+                logger.warning("Database circuit breaker opened after %d failures", self.failures)
+            self._state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class LastKnownGood:
+    """Last successfully read value per key, kept in memory and in a local file
+
+    Values are stored as given; `encoder` turns them into JSON-compatible data
+    when the file is written. Values loaded back from the file are plain JSON.
+    Writes to disk are batched to at most one every `persist_interval` seconds
+    and run in the default executor when called from the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        encoder: Callable[[Any], Any] = lambda value: value,
+        persist_interval: float = 30.0,
+    ):
+        self.path = path
+        self.encoder = encoder
+        self.persist_interval = persist_interval
+        self._values: Dict[str, Any] = {}
+        self._dirty = False
+        self._persisted_at = 0.0
+        self._writing: Optional[asyncio.Future] = None
+        self._write_lock = threading.Lock()
+        self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._values.get(key)
+
+    def put(self, key: str, value: Any):
+        self._values[key] = value
+        self._dirty = True
+        if time.monotonic() - self._persisted_at >= self.persist_interval:
+            self._persist_in_background()
+
+    def _persist_in_background(self):
+        """Write the file from a worker thread, off the event loop"""
+        if self._writing is not None and not self._writing.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.persist()
+            return
+        values = self._take_dirty()
+        if values is not None:
+            self._writing = loop.run_in_executor(None, self._write, values)
+
+    def persist(self):
+        """Atomically write the current values to `path` if they changed"""
+        values = self._take_dirty()
+        if values is not None:
+            self._write(values)
+
+    def _take_dirty(self) -> Optional[Dict[str, Any]]:
+        if self.path is None or not self._dirty:
+            return None
+        self._persisted_at = time.monotonic()
+        self._dirty = False
+        # Shallow copy: the writer thread must not see the dict change
+        return dict(self._values)
+
+    def _write(self, values: Dict[str, Any]):
+        with self._write_lock:
+            try:
+                payload = {key: self.encoder(value) for key, value in values.items()}
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Per-process temp file: workers share `path`
+                tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                self._dirty = True
+                logger.error("Error persisting last-known-good snapshot: %s", e)
+
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                self._values.update(json.load(f))
+        except Exception as e:
+            logger.error("Error loading last-known-good snapshot: %s", e)
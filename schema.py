@@ -0,0 +1,99 @@
+from typing import Dict, Type, TypeVar
+from datetime import datetime, timezone
+from enum import Enum
+from pydantic import BaseModel
+import uuid
+
+# Stored documents are keyed by a binary UUID `_id` (BSON subtype 4) and use
+# short field names. The mappings below translate between the public model
+# field names and the names persisted in MongoDB.
+#
+# Every stored document records the schema version it was written with in
+# `v`; documents without it predate versioning and count as version 1.
+# Version 2 guarantees contacts carry their content hash `h`.
+SCHEMA_VERSION = 2
+VERSION_FIELD = "v"
+
+PROJECT_FIELDS = {
+    "id": "_id",
+    "title": "t",
+    "description": "d",
+    "image": "img",
+    "technologies": "tech",
+    "category": "cat",
+    "demo_url": "demo",
+    "github_url": "gh",
+    "featured": "f",
+    "created_at": "ca",
+    "updated_at": "ua",
+}
+
+SKILL_FIELDS = {
+    "id": "_id",
+    "name": "n",
+    "level": "l",
+    "years": "y",
+    "category": "cat",
+    "created_at": "ca",
+}
+
+CONTACT_FIELDS = {
+    "id": "_id",
+    "name": "n",
+    "email": "e",
+    "subject": "s",
+    "message": "m",
+    "content_hash": "h",
+    "is_read": "r",
+    "created_at": "ca",
+}
+
+CONTACT_INFO_FIELDS = {
+    "id": "_id",
+    "email": "e",
+    "phone": "p",
+    "location": "loc",
+    "availability": "av",
+    "response_time": "rt",
+    "updated_at": "ua",
+}
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Attach UTC to naive datetimes, normalise aware ones to UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def to_document(model: BaseModel, fields: Dict[str, str]) -> dict:
+    """Convert a model (or read record) into its compact stored form"""
+    document = {}
+    for name, value in model.dict().items():
+        if value is None:
+            # Absent keys fall back to the model default on read
+            continue
+        if name == "id":
+            value = uuid.UUID(value)
+        elif isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = as_utc(value)
+        document[fields[name]] = value
+    document[VERSION_FIELD] = SCHEMA_VERSION
+    return document
+
+
+def from_document(document: dict, model: Type[M], fields: Dict[str, str]) -> M:
+    """Build a model from its compact stored form"""
+    data = {}
+    for name, key in fields.items():
+        if key not in document:
+            continue
+        value = document[key]
+        if name == "id":
+            value = str(value)
+        data[name] = value
+    return model(**data)
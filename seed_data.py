@@ -1,5 +1,6 @@
+from typing import Optional
 from models import Project, Skill, ContactInfo, SkillCategory
-from database import get_database
+from database import MAINTENANCE_OPERATION_TIMEOUT, Database, get_database, open_database
 import asyncio
 import logging
 
@@ -113,13 +114,16 @@ mock_contact_info = ContactInfo(
     response_time="Usually responds within 24 hours"
 )
 
-async def seed_database():
-    """Seed the database with initial data"""
+async def seed_database(db: Optional[Database] = None):
+    """Seed the database with initial data (default: the shared connection)"""
     try:
-        db = get_database()
+        db = db or get_database()
         
         logger.info("Starting database seeding...")
         
+        # Indexes first so seeded documents are indexed on insert
+        await db.ensure_indexes()
+        
         # Seed projects
         await db.seed_projects(mock_projects)
         
@@ -132,8 +136,16 @@ async def seed_database():
         logger.info("Database seeding completed successfully!")
         
     except Exception as e:
-        logger.error(f"Error seeding database: {e}")
+        logger.error("Error seeding database: %s", e)
         raise
 
+async def seed_standalone():
+    """Seed on a connection with the maintenance deadline, for index builds"""
+    db = open_database(MAINTENANCE_OPERATION_TIMEOUT)
+    try:
+        await seed_database(db)
+    finally:
+        await db.close()
+
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    asyncio.run(seed_standalone())
\ No newline at end of file
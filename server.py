@@ -1,46 +1,199 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Literal, Optional
+import asyncio
+import hashlib
+import json
 import os
 import logging
+import threading
 from contextlib import asynccontextmanager
 
 # Import our models and database
 from models import (
-    Project, Skill, Contact, ContactInfo, ContactSubmission,
-    ApiResponse, SkillsResponse
+    Project, Skill, Contact, ContactResponse, ContactInfo, ContactSubmission,
+    ApiResponse, SkillsResponse, SkillsSummary, SkillUpdate, ProjectEventBatch,
+    AdminLogin, TokenResponse
 )
 from database import get_database
-from seed_data import seed_database
+from records import jsonable
+from resilience import LastKnownGood
+from analytics import EventAggregator, DEFAULT_BUCKET_SECONDS, DEFAULT_FLUSH_INTERVAL
+from shared_snapshot import SharedSnapshotReader, SharedSnapshotWriter, SnapshotResponse
+from render import FragmentCache, render_contact_info, render_page, render_projects, render_skills
+from structured_logging import RequestLoggingMiddleware, configure_logging
+from profiler import (
+    MAX_PROFILE_SECONDS, SamplingProfiler, SlowRequestMiddleware, SlowRequestTracer,
+    format_collapsed
+)
+from auth import authenticate, issue_token, require_admin
+from seed_data import seed_standalone
 
 # Setup
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging: JSON lines written by a background thread, see structured_logging
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Last successful result of each public read, served while the database is unavailable
+last_known_good = LastKnownGood(
+    Path(os.environ.get('LKG_SNAPSHOT_PATH', ROOT_DIR / '.cache' / 'last_known_good.json')),
+    encoder=jsonable,
+)
+
+async def read_with_fallback(key: str, fetch: Callable[[], Awaitable[Any]], response: Response) -> Any:
+    """Run a read, falling back to the last-known-good value flagged as stale"""
+    try:
+        data = await fetch()
+    except Exception as e:
+        cached = last_known_good.get(key)
+        if cached is None:
+            raise
+        logger.warning("Serving stale %s: %r", key, e)
+        response.headers["X-Data-Stale"] = "true"
+        return cached
+    last_known_good.put(key, data)
+    return data
+
+# Snapshot of the public read responses shared by all workers through a
+# memory-mapped file; an empty SHARED_SNAPSHOT_PATH disables it.
+SHARED_SNAPSHOT_PATH = os.environ.get(
+    'SHARED_SNAPSHOT_PATH', str(ROOT_DIR / '.cache' / 'portfolio.snapshot')
+)
+SHARED_SNAPSHOT_REFRESH_SECONDS = float(os.environ.get('SHARED_SNAPSHOT_REFRESH_SECONDS', 30))
+# Past this age the writer has missed several refreshes (the database is
+# likely unreadable): reads go through read_with_fallback instead
+SHARED_SNAPSHOT_MAX_AGE = 3 * SHARED_SNAPSHOT_REFRESH_SECONDS
+# Snapshots are only shared between workers of the same database
+SNAPSHOT_SOURCE = f"{os.environ.get('MONGO_URL', '')}/{os.environ.get('DB_NAME', '')}"
+shared_snapshot = SharedSnapshotReader(
+    Path(SHARED_SNAPSHOT_PATH) if SHARED_SNAPSHOT_PATH else None,
+    source=SNAPSHOT_SOURCE,
+    max_age=SHARED_SNAPSHOT_MAX_AGE,
+)
+snapshot_writer = (
+    SharedSnapshotWriter(Path(SHARED_SNAPSHOT_PATH), source=SNAPSHOT_SOURCE)
+    if SHARED_SNAPSHOT_PATH else None
+)
+
+def encode_json(data: Any) -> bytes:
+    """Serialize like FastAPI's JSONResponse does"""
+    return json.dumps(
+        jsonable(data), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+def snapshot_response(name: str) -> Optional[SnapshotResponse]:
+    """Serve a section of the shared snapshot without copying it"""
+    body = shared_snapshot.get(name)
+    if body is None:
+        return None
+    return SnapshotResponse(
+        body,
+        media_type="application/json",
+        headers={"X-Snapshot-Version": str(shared_snapshot.version)},
+    )
+
+async def publish_shared_snapshot():
+    """Serialize the public read responses into a new snapshot version"""
+    db = get_database()
+    projects, featured, skills, summary, contact_info = await asyncio.gather(
+        db.get_projects(),
+        db.get_featured_projects(),
+        db.get_skills(),
+        db.get_skills_summary(),
+        db.get_contact_info(),
+    )
+    sections: Dict[str, bytes] = {
+        "projects": encode_json(projects),
+        "featured_projects": encode_json(featured),
+        "skills": encode_json(SkillsResponse(**skills)),
+        "skills_summary": encode_json(summary),
+    }
+    if contact_info:
+        sections["contact_info"] = encode_json(contact_info)
+    if snapshot_writer.publish(sections):
+        logger.info("Published shared snapshot with new content")
+
+async def load_section(name: str, response: Response) -> Optional[bytes]:
+    """JSON body of a public read, from the shared snapshot or the database"""
+    body = shared_snapshot.get(name)
+    if body is not None:
+        return body
+    db = get_database()
+    fetch = {
+        "projects": db.get_projects,
+        "featured_projects": db.get_featured_projects,
+        "skills": db.get_skills,
+        "skills_summary": db.get_skills_summary,
+        "contact_info": db.get_contact_info,
+    }[name]
+    data = await read_with_fallback(name, fetch, response)
+    return None if data is None else encode_json(data)
+
+async def refresh_shared_snapshot_now():
+    """Publish a new snapshot if this worker holds (or can take) the writer lock"""
+    if snapshot_writer is None:
+        return
+    try:
+        if snapshot_writer.try_acquire():
+            await publish_shared_snapshot()
+    except Exception as e:
+        logger.error("Error refreshing shared snapshot: %s", e)
+
+async def refresh_shared_snapshot():
+    """Keep the snapshot fresh from whichever worker holds the writer lock"""
+    while True:
+        await refresh_shared_snapshot_now()
+        await asyncio.sleep(SHARED_SNAPSHOT_REFRESH_SECONDS)
+
+# Project view/click events, counted in memory and flushed in batches
+event_aggregator = EventAggregator(
+    lambda counts, flush_id: get_database().record_project_events(counts, flush_id),
+    bucket_seconds=int(os.environ.get('ANALYTICS_BUCKET_SECONDS', DEFAULT_BUCKET_SECONDS)),
+    flush_interval=float(os.environ.get('ANALYTICS_FLUSH_SECONDS', DEFAULT_FLUSH_INTERVAL)),
+)
+
 # Lifespan manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting portfolio backend...")
     try:
-        # Seed database with initial data
-        await seed_database()
+        # Seed database with initial data; index builds get the long
+        # maintenance deadline rather than the request-path one
+        await seed_standalone()
         logger.info("Database seeded successfully")
     except Exception as e:
-        logger.error(f"Error during startup: {e}")
+        logger.error("Error during startup: %s", e)
+    
+    refresher = None
+    if snapshot_writer is not None:
+        refresher = asyncio.create_task(refresh_shared_snapshot())
+    event_flusher = asyncio.create_task(event_aggregator.run())
     
     yield
     
     # Shutdown
     logger.info("Shutting down portfolio backend...")
+    if refresher is not None:
+        refresher.cancel()
+        snapshot_writer.release()
+    # Let a flush in progress put its counts back before the final one
+    event_flusher.cancel()
+    try:
+        await event_flusher
+    except asyncio.CancelledError:
+        pass
+    try:
+        await event_aggregator.flush()
+    except Exception as e:
+        logger.error("Error flushing project events on shutdown: %s", e)
+    last_known_good.persist()
     db = get_database()
     await db.close()
 
@@ -55,6 +208,16 @@ app = FastAPI(
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Traces of requests slower than SLOW_REQUEST_THRESHOLD_MS (0 disables);
+# runs inside the logging middleware, which provides the request context
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', 500))
+slow_request_tracer = SlowRequestTracer(SLOW_REQUEST_THRESHOLD_MS)
+if SLOW_REQUEST_THRESHOLD_MS > 0:
+    app.add_middleware(SlowRequestMiddleware, tracer=slow_request_tracer)
+
+# Request id, route, status and DB time for every request
+app.add_middleware(RequestLoggingMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -71,39 +234,97 @@ async def root():
 
 # Project endpoints
 @api_router.get("/projects", response_model=list[Project])
-async def get_projects():
+async def get_projects(response: Response):
     """Get all projects"""
+    cached = snapshot_response("projects")
+    if cached is not None:
+        return cached
     try:
         db = get_database()
-        projects = await db.get_projects()
+        projects = await read_with_fallback("projects", db.get_projects, response)
         return projects
     except Exception as e:
-        logger.error(f"Error getting projects: {e}")
+        logger.error("Error getting projects: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch projects")
 
 @api_router.get("/projects/featured", response_model=list[Project])
-async def get_featured_projects():
-    """Get featured projects only"""
+async def get_featured_projects(response: Response, order: Optional[Literal["popular"]] = None):
+    """Get featured projects only, optionally most clicked first"""
+    if order == "popular":
+        return await get_popular_featured_projects(response)
+    cached = snapshot_response("featured_projects")
+    if cached is not None:
+        return cached
     try:
         db = get_database()
-        projects = await db.get_featured_projects()
+        projects = await read_with_fallback("featured_projects", db.get_featured_projects, response)
         return projects
     except Exception as e:
-        logger.error(f"Error getting featured projects: {e}")
+        logger.error("Error getting featured projects: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch featured projects")
+
+async def get_popular_featured_projects(response: Response) -> list:
+    """Featured projects ordered by clicks, then views"""
+    try:
+        body = await load_section("featured_projects", response)
+        projects = json.loads(bytes(body))
+    except Exception as e:
+        logger.error("Error getting featured projects: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch featured projects")
+    try:
+        db = get_database()
+        popularity = await db.get_project_popularity([project["id"] for project in projects])
+    except Exception as e:
+        # The featured list itself is still good; serve it in the default order
+        logger.warning("Serving featured projects unordered: %r", e)
+        return projects
+    no_events = (0, 0)
+    return sorted(projects, key=lambda project: popularity.get(project["id"], no_events), reverse=True)
 
 # Skills endpoints
 @api_router.get("/skills", response_model=SkillsResponse)
-async def get_skills():
+async def get_skills(response: Response):
     """Get all skills grouped by category"""
+    cached = snapshot_response("skills")
+    if cached is not None:
+        return cached
     try:
         db = get_database()
-        skills = await db.get_skills()
+        skills = await read_with_fallback("skills", db.get_skills, response)
         return SkillsResponse(**skills)
     except Exception as e:
-        logger.error(f"Error getting skills: {e}")
+        logger.error("Error getting skills: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch skills")
 
+@api_router.get("/skills/summary", response_model=SkillsSummary)
+async def get_skills_summary(response: Response):
+    """Per-category averages and top skills, maintained as skills change"""
+    cached = snapshot_response("skills_summary")
+    if cached is not None:
+        return cached
+    try:
+        db = get_database()
+        return await read_with_fallback("skills_summary", db.get_skills_summary, response)
+    except Exception as e:
+        logger.error("Error getting skills summary: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch skills summary")
+
+# Analytics endpoints
+@api_router.post("/events", response_model=ApiResponse, status_code=202)
+async def record_events(request: Request):
+    """Accept a batch of project view/click events"""
+    # navigator.sendBeacon posts text/plain, so parse the body whatever its content type
+    try:
+        batch = ProjectEventBatch(**json.loads(await request.body()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=422, detail="Invalid event batch")
+    event_aggregator.record(batch.events)
+    return ApiResponse(
+        success=True,
+        message="Events recorded",
+        data={"accepted": len(batch.events)}
+    )
+
 # Contact endpoints
 @api_router.post("/contact", response_model=ApiResponse)
 async def submit_contact(contact_data: ContactSubmission):
@@ -114,26 +335,33 @@ async def submit_contact(contact_data: ContactSubmission):
         # Create contact object
         contact = Contact(**contact_data.dict())
         
-        # Save to database
+        # Save to database; a repeat of a recent submission is not stored again
         contact_id = await db.create_contact(contact)
+        duplicate = contact_id != contact.id
         
-        logger.info(f"New contact submission: {contact.name} - {contact.subject}")
+        if duplicate:
+            logger.info("Duplicate contact submission: %s", contact_id)
+        else:
+            logger.info("New contact submission: %s - %s", contact.name, contact.subject)
         
         return ApiResponse(
             success=True,
             message="Message sent successfully! I'll get back to you soon.",
-            data={"id": contact_id}
+            data={"id": contact_id, "duplicate": duplicate}
         )
     except Exception as e:
-        logger.error(f"Error submitting contact: {e}")
+        logger.error("Error submitting contact: %s", e)
         raise HTTPException(status_code=500, detail="Failed to submit contact form")
 
 @api_router.get("/contact-info", response_model=ContactInfo)
-async def get_contact_info():
+async def get_contact_info(response: Response):
     """Get contact information"""
+    cached = snapshot_response("contact_info")
+    if cached is not None:
+        return cached
     try:
         db = get_database()
-        contact_info = await db.get_contact_info()
+        contact_info = await read_with_fallback("contact_info", db.get_contact_info, response)
         
         if not contact_info:
             raise HTTPException(status_code=404, detail="Contact information not found")
@@ -142,11 +370,25 @@ async def get_contact_info():
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting contact info: {e}")
+        logger.error("Error getting contact info: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch contact information")
 
-# Admin endpoints (for future use)
-@api_router.get("/contacts", response_model=list[Contact])
+# Auth endpoints
+@api_router.post("/auth/token", response_model=TokenResponse)
+async def create_token(credentials: AdminLogin):
+    """Exchange admin credentials for a bearer token"""
+    if not await authenticate(credentials.username, credentials.password):
+        logger.warning("Failed admin login for %s", credentials.username)
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    token, expires_in = issue_token(credentials.username)
+    return TokenResponse(access_token=token, expires_in=expires_in)
+
+# Admin endpoints
+@api_router.get("/contacts", response_model=list[ContactResponse], dependencies=[Depends(require_admin)])
 async def get_contacts():
     """Get all contact submissions (admin only)"""
     try:
@@ -154,9 +396,142 @@ async def get_contacts():
         contacts = await db.get_contacts()
         return contacts
     except Exception as e:
-        logger.error(f"Error getting contacts: {e}")
+        logger.error("Error getting contacts: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch contacts")
 
+@api_router.patch("/skills/{skill_id}", response_model=ApiResponse, dependencies=[Depends(require_admin)])
+async def update_skill(skill_id: str, update: SkillUpdate):
+    """Edit a skill and rebuild the skills summary (admin only)"""
+    try:
+        db = get_database()
+        updated = await db.update_skill(skill_id, update)
+    except Exception as e:
+        logger.error("Error updating skill: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to update skill")
+    if not updated:
+        raise HTTPException(status_code=404, detail="Skill not found")
+    # Other workers' edits reach the snapshot on its next refresh
+    await refresh_shared_snapshot_now()
+    return ApiResponse(success=True, message="Skill updated", data={"id": skill_id})
+
+def section_version(body: Optional[bytes]) -> bytes:
+    """Content digest of a section body"""
+    return hashlib.blake2b(body or b"", digest_size=16).digest()
+
+def cache_headers(version: bytes, response: Response) -> Dict[str, str]:
+    """ETag and caching headers for a combined response; stale data is not cached"""
+    stale = "X-Data-Stale" in response.headers
+    headers = {
+        "ETag": f'"{version.hex()}"',
+        "Cache-Control": "no-cache" if stale else "public, max-age=60",
+    }
+    if stale:
+        headers["X-Data-Stale"] = "true"
+    return headers
+
+# Portfolio bundle: every public section in one round-trip
+BUNDLE_SECTIONS = {
+    "projects": "projects",
+    "featured": "featured_projects",
+    "skills": "skills",
+    "contact_info": "contact_info",
+}
+bundle_cache = FragmentCache()
+
+@api_router.get("/portfolio")
+async def get_portfolio(request: Request, response: Response):
+    """Projects, featured projects, skills and contact info in one document"""
+    try:
+        bodies = await asyncio.gather(
+            *(load_section(section, response) for section in BUNDLE_SECTIONS.values())
+        )
+    except Exception as e:
+        logger.error("Error getting portfolio: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch portfolio")
+
+    version = hashlib.blake2b(
+        b"".join(section_version(body) for body in bodies), digest_size=16
+    ).digest()
+    headers = cache_headers(version, response)
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    # The sections are already serialized, so splice them rather than re-encode
+    bundle = bundle_cache.get("bundle", version)
+    if bundle is None:
+        parts = [
+            b'"%s":%s' % (key.encode(), bytes(body) if body is not None else b"null")
+            for key, body in zip(BUNDLE_SECTIONS, bodies)
+        ]
+        bundle = b"{" + b",".join(parts) + b"}"
+        bundle_cache.put("bundle", version, bundle)
+    return Response(bundle, media_type="application/json", headers=headers)
+
+# Server-side rendering
+RENDERED_SECTIONS = {
+    "projects": render_projects,
+    "skills": render_skills,
+    "contact_info": render_contact_info,
+}
+# Fragments and the assembled page, keyed by the content they were rendered from
+fragment_cache = FragmentCache()
+page_cache = FragmentCache()
+
+@api_router.get("/render", response_class=HTMLResponse)
+async def render_portfolio(request: Request, response: Response):
+    """Server-rendered portfolio page for crawlers and first paint"""
+    try:
+        bodies = await asyncio.gather(
+            *(load_section(name, response) for name in RENDERED_SECTIONS)
+        )
+    except Exception as e:
+        logger.error("Error loading data for render: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to render portfolio")
+
+    versions = [section_version(body) for body in bodies]
+    page_version = hashlib.blake2b(b"".join(versions), digest_size=16).digest()
+    headers = cache_headers(page_version, response)
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    page = page_cache.get("page", page_version)
+    if page is None:
+        fragments = []
+        for (name, render), body, version in zip(RENDERED_SECTIONS.items(), bodies, versions):
+            fragment = fragment_cache.get(name, version)
+            if fragment is None:
+                fragment = render(json.loads(bytes(body)) if body is not None else None)
+                fragment_cache.put(name, version, fragment)
+            fragments.append(fragment)
+        page = render_page(fragments)
+        page_cache.put("page", page_version, page)
+    return HTMLResponse(page, headers=headers)
+
+# Profiling endpoints (admin only)
+profiler = SamplingProfiler()
+
+@api_router.post("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5, ge=1, le=1000),
+):
+    """Sample the event loop for `seconds`; returns collapsed stacks for flamegraphs"""
+    if profiler.busy:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    # Sampling runs in a worker thread; this thread is the one serving requests
+    samples = await asyncio.to_thread(profiler.run, threading.get_ident(), seconds, interval_ms / 1000)
+    if samples is None:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    return PlainTextResponse(format_collapsed(samples))
+
+@api_router.get("/admin/slow-traces", dependencies=[Depends(require_admin)])
+async def get_slow_traces():
+    """Most recent requests slower than SLOW_REQUEST_THRESHOLD_MS, newest first"""
+    return {
+        "threshold_ms": SLOW_REQUEST_THRESHOLD_MS,
+        "traces": list(reversed(slow_request_tracer.traces)),
+    }
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -0,0 +1,186 @@
+from typing import Dict, Optional
+from pathlib import Path
+from starlette.responses import Response
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import time
+
+logger = logging.getLogger(__name__)
+
+# File layout (little endian):
+#   header  magic(8s) version = publish time in ns(Q) source digest(16s) section count(I)
+#   index   per section: name length(H) name offset(Q) length(Q)
+#   payload the section bodies, concatenated
+MAGIC = b"PFSNAP02"
+HEADER = struct.Struct("<8sQ16sI")
+NAME_LENGTH = struct.Struct("<H")
+SPAN = struct.Struct("<QQ")
+
+
+def source_digest(source: str) -> bytes:
+    """Identity of the database a snapshot was built from"""
+    return hashlib.blake2b(source.encode(), digest_size=16).digest()
+
+
+def write_snapshot(path: Path, version: int, source: bytes, sections: Dict[str, bytes]):
+    """Write a snapshot next to `path` and atomically rename it into place"""
+    index = b""
+    offset = 0
+    entries = []
+    for name, body in sections.items():
+        encoded = name.encode()
+        entries.append((encoded, offset, len(body)))
+        offset += len(body)
+    header_size = HEADER.size + sum(NAME_LENGTH.size + len(n) + SPAN.size for n, _, _ in entries)
+    for encoded, start, length in entries:
+        index += NAME_LENGTH.pack(len(encoded)) + encoded + SPAN.pack(header_size + start, length)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, version, source, len(entries)))
+        f.write(index)
+        for body in sections.values():
+            f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SnapshotResponse(Response):
+    """Response whose body is sent straight from the mapped snapshot"""
+
+    def render(self, content) -> memoryview:
+        return content
+
+
+class SharedSnapshotReader:
+    """Zero-copy view of the snapshot file shared by every worker
+
+    The file is re-opened when a new version has been renamed into place;
+    this is checked at most once every `check_interval` seconds. Snapshots
+    built from another database (`source`) are ignored, and sections are not
+    served once the snapshot is older than `max_age` seconds: the writer
+    republishes on every refresh, so an old snapshot means it cannot read
+    the database.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        source: str = "",
+        max_age: Optional[float] = None,
+        check_interval: float = 1.0,
+    ):
+        self.path = path
+        self.source = source_digest(source)
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self.version = 0
+        self._sections: Dict[str, memoryview] = {}
+        self._identity = None
+        self._checked_at = 0.0
+
+    def get(self, name: str) -> Optional[memoryview]:
+        """Body of a section from the current snapshot, if there is one"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._reload()
+        if self.max_age is not None and self.age() > self.max_age:
+            return None
+        return self._sections.get(name)
+
+    def age(self) -> float:
+        """Seconds since the loaded snapshot was published"""
+        return time.time() - self.version / 1e9
+
+    def _reload(self):
+        if self.path is None:
+            return
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        if identity == self._identity:
+            return
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            magic, version, source, count = HEADER.unpack_from(view, 0)
+            if magic != MAGIC:
+                raise ValueError(f"unexpected snapshot magic {magic!r}")
+            if source != self.source:
+                raise ValueError("snapshot was built from another database")
+            sections = {}
+            position = HEADER.size
+            for _ in range(count):
+                (name_length,) = NAME_LENGTH.unpack_from(view, position)
+                position += NAME_LENGTH.size
+                name = bytes(view[position:position + name_length]).decode()
+                position += name_length
+                start, length = SPAN.unpack_from(view, position)
+                position += SPAN.size
+                sections[name] = view[start:start + length]
+        except Exception as e:
+            # Not retried until the file is replaced
+            self._identity = identity
+            logger.error("Error loading shared snapshot: %s", e)
+            return
+        # Views of the previous mapping keep it alive until responses using
+        # them have been sent; it is unmapped once the last one is dropped.
+        self._sections = sections
+        self._identity = identity
+        self.version = version
+        logger.info("Loaded shared snapshot version %s", version)
+
+
+class SharedSnapshotWriter:
+    """Publishes snapshots; only the worker holding the lock file writes"""
+
+    def __init__(self, path: Path, source: str = ""):
+        self.path = path
+        self.source = source_digest(source)
+        self._lock_file = None
+        self._digest = None
+
+    def try_acquire(self) -> bool:
+        """Become the writer if no other live worker is; released on exit"""
+        if self._lock_file is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.path.with_name(self.path.name + ".lock"), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def publish(self, sections: Dict[str, bytes]) -> bool:
+        """Write a new version; returns whether the content changed
+
+        Unchanged content is written again too, so the publish time readers
+        use to judge freshness keeps moving while the database is readable.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for name, body in sections.items():
+            digest.update(name.encode())
+            digest.update(body)
+        digest = digest.digest()
+        write_snapshot(self.path, time.time_ns(), self.source, sections)
+        changed = digest != self._digest
+        self._digest = digest
+        return changed
+
+    def release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
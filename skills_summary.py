@@ -0,0 +1,131 @@
+"""
+Materialized skills statistics
+
+The summary is one document in `skills_summary` holding, per category, the
+count and the sums the averages are derived from, plus the top skills by
+level and by experience-weighted score. Creating a skill folds it into the
+summary with `$inc`/`$push`; bulk recomputation uses NumPy.
+"""
+
+from typing import Dict, Iterable, List
+from datetime import datetime
+import numpy as np
+
+from models import SkillCategory
+
+SUMMARY_ID = "skills"
+TOP_SKILLS = 10
+
+# Sort orders for the ranked lists, shared by $push and the bulk path
+TOP_ORDER = {"level": -1, "years": -1}
+RANKED_ORDER = {"score": -1}
+
+
+def experience_score(level, years):
+    """Level weighted by experience, with diminishing returns on years"""
+    return np.round(level * (1 + np.log1p(years)), 2)
+
+
+def skill_entry(skill_id, name: str, category: str, level: int, years: int) -> dict:
+    return {
+        "id": skill_id,
+        "name": name,
+        "category": category,
+        "level": level,
+        "years": years,
+        "score": float(experience_score(level, years)),
+    }
+
+
+def empty_categories() -> Dict[str, dict]:
+    return {
+        category.value: {"count": 0, "level_sum": 0, "years_sum": 0, "weighted_sum": 0}
+        for category in SkillCategory
+    }
+
+
+def incremental_update(entry: dict, now: datetime) -> dict:
+    """Update document folding one new skill into the summary"""
+    prefix = f"categories.{entry['category']}"
+    return {
+        "$inc": {
+            f"{prefix}.count": 1,
+            f"{prefix}.level_sum": entry["level"],
+            f"{prefix}.years_sum": entry["years"],
+            f"{prefix}.weighted_sum": entry["level"] * entry["years"],
+        },
+        "$push": {
+            "top": {"$each": [entry], "$sort": TOP_ORDER, "$slice": TOP_SKILLS},
+            "ranked": {"$each": [entry], "$sort": RANKED_ORDER, "$slice": TOP_SKILLS},
+        },
+        "$set": {"ua": now},
+    }
+
+
+def summarize(skills: Iterable[dict], now: datetime) -> dict:
+    """Full summary document from stored skill documents (_id, n, l, y, cat)"""
+    skills = list(skills)
+    categories = empty_categories()
+    document = {"_id": SUMMARY_ID, "categories": categories, "top": [], "ranked": [], "ua": now}
+    if not skills:
+        return document
+
+    levels = np.fromiter((s["l"] for s in skills), dtype=np.int64, count=len(skills))
+    years = np.fromiter((s["y"] for s in skills), dtype=np.int64, count=len(skills))
+    names, codes = np.unique(np.array([s["cat"] for s in skills]), return_inverse=True)
+    counts = np.bincount(codes, minlength=len(names))
+    level_sums = np.bincount(codes, weights=levels, minlength=len(names))
+    years_sums = np.bincount(codes, weights=years, minlength=len(names))
+    weighted_sums = np.bincount(codes, weights=levels * years, minlength=len(names))
+    for i, name in enumerate(names):
+        categories[str(name)] = {
+            "count": int(counts[i]),
+            "level_sum": int(level_sums[i]),
+            "years_sum": int(years_sums[i]),
+            "weighted_sum": int(weighted_sums[i]),
+        }
+
+    scores = experience_score(levels, years)
+
+    def entries(order: np.ndarray) -> List[dict]:
+        return [
+            {
+                "id": skills[i]["_id"],
+                "name": skills[i]["n"],
+                "category": skills[i]["cat"],
+                "level": int(levels[i]),
+                "years": int(years[i]),
+                "score": float(scores[i]),
+            }
+            for i in order[:TOP_SKILLS]
+        ]
+
+    # lexsort sorts by the last key first; stable, like $push's $sort
+    document["top"] = entries(np.lexsort((-years, -levels)))
+    document["ranked"] = entries(np.argsort(-scores, kind="stable"))
+    return document
+
+
+def to_response(document: dict) -> dict:
+    """Public form of the summary: averages derived from the stored sums"""
+    categories = {}
+    for name, totals in document["categories"].items():
+        count = totals["count"]
+        categories[name] = {
+            "count": count,
+            "average_level": round(totals["level_sum"] / count, 2) if count else 0.0,
+            "average_years": round(totals["years_sum"] / count, 2) if count else 0.0,
+            "experience_weighted_level": (
+                round(totals["weighted_sum"] / totals["years_sum"], 2) if totals["years_sum"] else 0.0
+            ),
+        }
+
+    def public(entries: List[dict]) -> List[dict]:
+        return [{**entry, "id": str(entry["id"])} for entry in entries]
+
+    return {
+        "categories": categories,
+        "top_skills": public(document["top"]),
+        "experience_ranking": public(document["ranked"]),
+        "updated_at": document["ua"],
+    }
@@ -0,0 +1,179 @@
+from typing import Optional
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+
+# Per-request fields attached to every record logged while handling it.
+# The dict is shared with tasks spawned by the request (asyncio.gather copies
+# the context, not the dict), so DB time from concurrent reads adds up.
+request_context: ContextVar[Optional[dict]] = ContextVar("request_context", default=None)
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def record_db_time(seconds: float):
+    """Add time spent in a database call to the current request"""
+    context = request_context.get()
+    if context is not None:
+        context["db_ms"] += seconds * 1000
+
+
+class ContextQueueHandler(QueueHandler):
+    """Enqueue records without formatting them
+
+    The stock QueueHandler formats the message in the calling thread; here
+    that is left to the listener thread, so a log call on the event loop
+    costs a filter check, a dict copy and a queue put.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        context = request_context.get()
+        if context is not None:
+            for key, value in context.items():
+                if not hasattr(record, key):
+                    setattr(record, key, value)
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every WARNING and above, and a `rate` fraction of the rest
+
+    Records logged with `extra={"sample": False}` are always kept.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        if not getattr(record, "sample", True):
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the record's extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "sample":
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+JsonFormatter.converter = time.gmtime
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[ContextQueueHandler] = None
+_stream_handler: Optional[logging.Handler] = None
+
+
+def _start_listener():
+    """Give the queue handler a fresh queue and a thread draining it"""
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, _stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging():
+    """Route all logging through a queue drained by a background thread
+
+    LOG_LEVEL sets the root level (default INFO) and LOG_INFO_SAMPLE_RATE
+    the fraction of INFO/DEBUG records kept (default 1.0).
+
+    Threads do not survive fork(): a process forked after this (a gunicorn
+    worker of a preloaded app) starts its own queue and listener.
+    """
+    global _queue_handler, _stream_handler
+    if _listener is not None:
+        return
+
+    _stream_handler = logging.StreamHandler(sys.stderr)
+    _stream_handler.setFormatter(JsonFormatter())
+
+    _queue_handler = ContextQueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(SamplingFilter(float(os.environ.get("LOG_INFO_SAMPLE_RATE", 1.0))))
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+
+    _start_listener()
+    # Records still queued in the parent at fork time stay with the parent
+    os.register_at_fork(after_in_child=_start_listener)
+    atexit.register(_stop_listener)
+
+
+class RequestLoggingMiddleware:
+    """Give each request an id and log one structured line when it finishes"""
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = logging.getLogger("access")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        context = {"request_id": request_id or uuid.uuid4().hex, "db_ms": 0.0}
+        token = request_context.set(context)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_context(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", []).append(
+                    (b"x-request-id", context["request_id"].encode("latin-1"))
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_context)
+        finally:
+            route = scope.get("route")
+            self.logger.info(
+                "%s %s %d", scope["method"], scope["path"], status,
+                extra={
+                    "route": getattr(route, "path", scope["path"]),
+                    "method": scope["method"],
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "db_ms": round(context["db_ms"], 3),
+                    # Errors are always logged
+                    "sample": status < 500,
+                },
+            )
+            request_context.reset(token)